@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Benchmark: chars/sec of the old per-character lookup in gematria-sum.py
+versus the precompiled GematriaEngine, on the Sefer Yetzirah corpus.
+
+Usage: python gematria-benchmark.py [repeat]
+"""
+
+import contextlib
+import io
+import json
+import sys
+import time
+
+from gematria import GematriaEngine, MULTI_SCRIPT_VALUES, strip_diacritics
+
+
+def legacy_letter_to_value(letter):
+    """The lookup as gematria-sum.py did it: new dict + NFD for every char."""
+    values = dict(MULTI_SCRIPT_VALUES)
+    letter_no_diacritics = strip_diacritics(letter)
+    if letter_no_diacritics in values:
+        return values[letter_no_diacritics.lower()]
+    elif letter.strip() == "":
+        return 0
+    else:
+        print(f"Warnung: Unbekanntes Zeichen '{letter}' ignoriert.")
+        return 0
+
+
+def legacy_calculate_gematria(text):
+    return sum(legacy_letter_to_value(letter) for letter in text if letter.strip() != "")
+
+
+def load_corpus(path="sefer_yetzirah.json"):
+    with open(path, "r", encoding="utf-8") as f:
+        return "\n".join(verse for chapter in json.load(f)["text"] for verse in chapter)
+
+
+def bench(label, func, text):
+    # Warnings for unknown characters would measure the terminal, not the lookup
+    with contextlib.redirect_stdout(io.StringIO()):
+        start = time.perf_counter()
+        value = func(text)
+        elapsed = time.perf_counter() - start
+    print(f"{label:<10} {len(text) / elapsed:>14,.0f} chars/sec  (value {value}, {elapsed:.3f}s)")
+    return value
+
+
+def main():
+    repeat = int(sys.argv[1]) if len(sys.argv) > 1 else 20
+    text = load_corpus() * repeat
+    print(f"Corpus: {len(text):,} chars")
+
+    start = time.perf_counter()
+    engine = GematriaEngine()
+    print(f"Engine build: {time.perf_counter() - start:.3f}s")
+
+    before = bench("before", legacy_calculate_gematria, text)
+    after = bench("after", engine.score, text)
+    assert before == after, (before, after)
+
+    # The corpus is all Hebrew; check capitals, accents and other scripts too
+    mixed = "שלום abc ABC X Ω ά Á é ☃ ﻻ سلام ἀγάπη שָׁלוֹם " + "".join(map(chr, range(0x20, 0x250)))
+    with contextlib.redirect_stdout(io.StringIO()):
+        for char in mixed:
+            assert legacy_calculate_gematria(char) == engine.score(char), char
+
+
+if __name__ == "__main__":
+    main()
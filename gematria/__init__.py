@@ -0,0 +1,6 @@
+"""
+Shared gematria core for the Sefer Yetzirah scripts.
+"""
+
+from .engine import GematriaEngine, format_unknown, strip_diacritics
+from .tables import MULTI_SCRIPT_VALUES, STANDARD_VALUES
@@ -0,0 +1,198 @@
+"""
+Batch analyzer: sum, product, inverses and adjacent ratios per verse.
+
+Merges the products/inverses pipeline (products-inverses-yetzirah.py) and
+the ratio pipeline (ratios-yetzirah.py) into one command. Verses are read
+with the streaming corpus reader, cut into shards, scored in a process pool
+and written back in their original order.
+
+Usage:
+    python -m gematria.analyze sefer_yetzirah.json [more corpora ...]
+        [--workers N] [--shard-size N] [--mode float|exact|log|mod]
+        [--table standard|hechrachi|gadol|multi|multi-hechrachi]
+        [--output results.npz|results.parquet|DIR] [--cache results.sqlite] [--strict]
+
+With --output the results are written as a columnar file (see
+gematria.columnar) instead of being printed. Characters without a value
+are counted (gematria.unknown) and reported once on stderr; with --strict
+the first verse containing one aborts the run.
+"""
+
+import argparse
+import os
+import sys
+from collections import Counter, deque
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+from typing import NamedTuple
+
+from .batch import score_corpus
+from .cache import DEFAULT_MAX_BYTES, ResultCache, cache_key
+from .columnar import write_results
+from .corpus import iter_verses
+from .engine import format_unknown
+from .products import PRODUCT_MODES, calculate_inverses, calculate_sum_and_product
+from .ratios import adjacent_ratios
+from .systems import SYSTEMS, lookup
+from .unknown import count_unknown
+
+
+class VerseMetrics(NamedTuple):
+    chapter: int
+    verse: int
+    text: str
+    values: list
+    sum: int
+    product: object
+    inverse_sum: object
+    inverse_product: object
+    ratios: list
+
+
+def analyze_shard(shard, table="standard", mode="float"):
+    """Scores a list of (chapter, verse, text) records; runs in a worker."""
+    scores = score_corpus([text.replace(" ", "") for _, _, text in shard], lookup(table))
+    ratios = adjacent_ratios(scores.values, scores.offsets)
+    results = []
+    for i, (chapter, verse, text) in enumerate(shard):
+        values = scores.values[scores.offsets[i]:scores.offsets[i + 1]]
+        if mode == "float":
+            sum_, product = int(scores.sums[i]), scores.products[i]
+        else:
+            sum_, product = calculate_sum_and_product(values.tolist(), mode)
+        inverse_sum, inverse_product = calculate_inverses(sum_, product)
+        results.append(VerseMetrics(chapter, verse, text, values.tolist(), sum_,
+                                    product, inverse_sum, inverse_product,
+                                    ratios.ratios[ratios.offsets[i]:ratios.offsets[i + 1]].tolist()))
+    return results
+
+
+def _shards(records, shard_size):
+    records = iter(records)
+    while True:
+        shard = list(islice(records, shard_size))
+        if not shard:
+            return
+        yield shard
+
+
+def _cached(shard, cache, table, mode):
+    """Splits a shard into cached results (by position) and records to compute."""
+    if cache is None:
+        return {}, shard
+    keys = [cache_key(text, table, f"analyze:{mode}") for _, _, text in shard]
+    found = cache.get_many(keys)
+    cached = {i: VerseMetrics(chapter, verse, text, *found[key])
+              for i, ((chapter, verse, text), key) in enumerate(zip(shard, keys)) if key in found}
+    return cached, [record for i, record in enumerate(shard) if i not in cached]
+
+
+def _merge(shard, cached, computed, cache, table, mode):
+    """The shard's results in input order; stores the computed ones."""
+    if cache is not None and computed:
+        cache.put_many((cache_key(m.text, table, f"analyze:{mode}"), tuple(m[3:]))
+                       for m in computed)
+    computed = iter(computed)
+    return [cached[i] if i in cached else next(computed) for i in range(len(shard))]
+
+
+def _account(shard, table, unknown, strict):
+    """Adds the shard's unknown characters to `unknown`; raises in strict mode."""
+    if unknown is None and not strict:
+        return
+    counts = count_unknown([text for _, _, text in shard], table)
+    if strict and len(counts.codepoints):
+        i = int(counts.per_verse.nonzero()[0][0])
+        chapter, verse, text = shard[i]
+        found = count_unknown([text], table).counter()
+        raise ValueError(f"verse {chapter}:{verse}: unknown characters {format_unknown(found)}")
+    if unknown is not None:
+        unknown.update(counts.counter())
+
+
+def analyze(records, table="standard", mode="float", workers=None, shard_size=256, cache=None,
+            unknown=None, strict=False):
+    """
+    Yields VerseMetrics for every record, in input order.
+    At most 2 * workers shards are in flight, so memory stays bounded.
+    With a ResultCache (gematria.cache) only verses whose text is not
+    cached for this table and mode are computed. Unknown characters are
+    added to the Counter `unknown`; strict=True raises ValueError instead.
+    """
+    workers = workers or os.cpu_count() or 1
+    if workers == 1:
+        for shard in _shards(records, shard_size):
+            _account(shard, table, unknown, strict)
+            cached, missing = _cached(shard, cache, table, mode)
+            computed = analyze_shard(missing, table, mode) if missing else []
+            yield from _merge(shard, cached, computed, cache, table, mode)
+        return
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        pending = deque()
+
+        def finish(shard, cached, future):
+            computed = future.result() if future is not None else []
+            return _merge(shard, cached, computed, cache, table, mode)
+
+        for shard in _shards(records, shard_size):
+            _account(shard, table, unknown, strict)
+            cached, missing = _cached(shard, cache, table, mode)
+            future = pool.submit(analyze_shard, missing, table, mode) if missing else None
+            pending.append((shard, cached, future))
+            if len(pending) >= 2 * workers:
+                yield from finish(*pending.popleft())
+        while pending:
+            yield from finish(*pending.popleft())
+
+
+def format_metrics(m: VerseMetrics) -> str:
+    return (f"Verse: {m.text}\nGematria:{m.values}\nSum: {m.sum}\nProduct: {m.product}\n"
+            f"Inverse of Sum: {m.inverse_sum}\nInverse of Product: {m.inverse_product}\n"
+            f"Ratios: {m.ratios}\n")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0].strip())
+    parser.add_argument("corpora", nargs="+", help="JSON ({\"text\": [[...]]}) or line files")
+    parser.add_argument("--workers", type=int, default=None, help="processes (default: all cores)")
+    parser.add_argument("--shard-size", type=int, default=256, help="verses per task")
+    parser.add_argument("--mode", choices=PRODUCT_MODES, default="float", help="product mode")
+    parser.add_argument("--table", choices=list(SYSTEMS), default="standard")
+    parser.add_argument("--output", help="write a columnar result file instead of printing")
+    parser.add_argument("--normalize", action="store_true",
+                        help="strip niqqud, te'amim, tashkeel and Greek accents first")
+    parser.add_argument("--cache", help="SQLite file caching per-verse results between runs")
+    parser.add_argument("--cache-size", type=int, default=DEFAULT_MAX_BYTES >> 20,
+                        help="cache limit in MiB (least recently used entries are evicted)")
+    parser.add_argument("--strict", action="store_true",
+                        help="fail on the first verse with a character that has no value")
+    args = parser.parse_args(argv)
+
+    cache = ResultCache(args.cache, args.cache_size << 20) if args.cache else None
+    unknown = Counter()
+    results = (metrics
+               for path in args.corpora
+               for metrics in analyze(iter_verses(path, args.normalize), args.table,
+                                      args.mode, args.workers, args.shard_size, cache,
+                                      unknown, args.strict))
+    try:
+        if args.output:
+            write_results(args.output, results, args.mode)
+            return
+        for metrics in results:
+            if metrics.values:
+                print(format_metrics(metrics))
+    except ValueError as e:
+        if not args.strict:
+            raise
+        sys.exit(f"error: {e}")
+    finally:
+        if unknown:
+            print(f"warning: {sum(unknown.values())} characters without a value counted as 0: "
+                  f"{format_unknown(unknown)}", file=sys.stderr)
+        if cache is not None:
+            cache.close()
+
+
+if __name__ == "__main__":
+    main()
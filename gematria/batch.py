@@ -0,0 +1,136 @@
+"""
+Vectorized scoring of whole corpora with NumPy.
+
+All verses are encoded into one uint32 codepoint array, mapped through a
+value lookup array with fancy indexing, and reduced per verse with
+segment reductions. Verse i always lives in values[offsets[i]:offsets[i+1]].
+"""
+
+from itertools import compress
+from typing import NamedTuple
+
+import numpy as np
+
+
+class CorpusScores(NamedTuple):
+    values: np.ndarray    # per-letter values, letters without a value dropped
+    offsets: np.ndarray   # segment boundaries into `values`, len(verses) + 1
+    sums: np.ndarray
+    counts: np.ndarray
+    products: np.ndarray  # float64, overflows to inf like np.prod does
+
+
+class WordScores(NamedTuple):
+    words: list           # words with a value, in corpus order
+    values: np.ndarray    # value per word
+    offsets: np.ndarray   # verse i's words are words[offsets[i]:offsets[i + 1]]
+
+
+def build_lookup(values) -> np.ndarray:
+    """Turns a {letter: value} mapping into a codepoint-indexed int64 array."""
+    letters = {ord(k): v for k, v in values.items() if len(k) == 1}
+    lookup = np.zeros(max(letters) + 1, dtype=np.int64)
+    lookup[list(letters)] = list(letters.values())
+    return lookup
+
+
+def encode_corpus(verses):
+    """
+    Encodes all verses into one uint32 codepoint array.
+    Returns (codepoints, offsets) with len(offsets) == len(verses) + 1.
+    """
+    verses = list(verses)
+    lengths = np.fromiter(map(len, verses), dtype=np.int64, count=len(verses))
+    offsets = np.zeros(len(verses) + 1, dtype=np.int64)
+    np.cumsum(lengths, out=offsets[1:])
+    codepoints = np.frombuffer("".join(verses).encode("utf-32-le"), dtype="<u4")
+    return codepoints, offsets
+
+
+def map_values(codepoints, lookup) -> np.ndarray:
+    """Maps codepoints to values; codepoints beyond the lookup array are 0."""
+    inside = codepoints < len(lookup)
+    return np.where(inside, lookup[np.where(inside, codepoints, 0)], 0)
+
+
+def segment_reduce(ufunc, values, offsets, identity):
+    """
+    ufunc.reduceat over the segments given by `offsets`. Unlike plain
+    reduceat, empty segments yield `identity` instead of the next element.
+    """
+    starts = offsets[:-1]
+    nonempty = offsets[1:] > starts
+    out = np.full(len(starts), identity, dtype=values.dtype)
+    if nonempty.any():
+        out[nonempty] = ufunc.reduceat(values, starts[nonempty])
+    return out
+
+
+def score_corpus(verses, values) -> CorpusScores:
+    """
+    Scores every verse in one vectorized pass.
+    `values` is a {letter: value} mapping or a lookup array from build_lookup.
+    """
+    lookup = values if isinstance(values, np.ndarray) else build_lookup(values)
+    codepoints, offsets = encode_corpus(verses)
+    letter_values = map_values(codepoints, lookup)
+
+    # Drop letters without a value, like text_to_gematria does
+    known = letter_values != 0
+    counts = segment_reduce(np.add, known.astype(np.int64), offsets, 0)
+    kept = letter_values[known]
+    kept_offsets = np.zeros_like(offsets)
+    np.cumsum(counts, out=kept_offsets[1:])
+
+    sums = segment_reduce(np.add, kept, kept_offsets, 0)
+    with np.errstate(over="ignore"):
+        products = segment_reduce(np.multiply, kept.astype(np.float64), kept_offsets, 1.0)
+    return CorpusScores(kept, kept_offsets, sums, counts, products)
+
+
+# Characters that separate words: whitespace and maqaf
+SEPARATORS = np.array([ord(c) for c in " \t\n\r\u00a0\u05be"], dtype=np.uint32)
+
+
+def split_words(text):
+    """Words of a verse: split at whitespace and maqaf."""
+    return text.replace("־", " ").split()
+
+
+def word_numbers(codepoints, offsets):
+    """
+    Running word number of every character of an encoded corpus. A word
+    starts after a separator or at the start of a verse, so niqqud, geresh
+    and gershayim stay inside their word; separators carry the number of
+    the word before them.
+    """
+    inside = ~np.isin(codepoints, SEPARATORS)
+    begins = inside.copy()
+    begins[1:] &= ~inside[:-1]
+    verse_starts = offsets[:-1][offsets[:-1] < len(inside)]
+    begins[verse_starts] = inside[verse_starts]
+    return np.cumsum(begins)
+
+
+def score_words(verses, values) -> WordScores:
+    """
+    Scores every word of every verse in one vectorized pass. Words without
+    any letter value (punctuation, numbers) are dropped.
+    """
+    lookup = values if isinstance(values, np.ndarray) else build_lookup(values)
+    words, counts = [], []
+    for text in verses:
+        verse_words = split_words(text)
+        words.extend(verse_words)
+        counts.append(len(verse_words))
+
+    codepoints, char_offsets = encode_corpus(words)
+    prefix = np.zeros(len(codepoints) + 1, dtype=np.int64)
+    np.cumsum(map_values(codepoints, lookup), out=prefix[1:])
+    word_values = prefix[char_offsets[1:]] - prefix[char_offsets[:-1]]
+
+    kept = word_values != 0
+    word_verse = np.repeat(np.arange(len(counts)), counts)[kept]
+    offsets = np.zeros(len(counts) + 1, dtype=np.int64)
+    np.cumsum(np.bincount(word_verse, minlength=len(counts)), out=offsets[1:])
+    return WordScores(list(compress(words, kept.tolist())), word_values[kept], offsets)
@@ -0,0 +1,121 @@
+"""
+Persistent per-verse result cache.
+
+Results are stored in one SQLite file (stdlib sqlite3), keyed by a hash of
+(text, gematria system, method), so a re-run over a mostly unchanged corpus
+only recomputes the verses whose text changed. Every hit refreshes the
+entry's last-used stamp; when the stored results exceed max_bytes, the
+least recently used entries are evicted.
+
+Used by `python -m gematria.analyze --cache results.sqlite`.
+"""
+
+import hashlib
+import pickle
+import sqlite3
+import time
+
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+
+# SQLite's default limit on host parameters per statement is 999
+_BATCH = 500
+
+
+def cache_key(text, system, method) -> bytes:
+    """128-bit BLAKE2b digest of (text, system, method)."""
+    digest = hashlib.blake2b(digest_size=16)
+    for part in (system, method, text):
+        encoded = part.encode("utf-8")
+        digest.update(len(encoded).to_bytes(8, "little"))
+        digest.update(encoded)
+    return digest.digest()
+
+
+class ResultCache:
+    """
+    Size-bounded LRU cache of picklable results in an SQLite file.
+
+        with ResultCache("results.sqlite") as cache:
+            keys = [cache_key(text, "standard", "analyze:float") for text in texts]
+            found = cache.get_many(keys)
+            cache.put_many((k, compute(t)) for k, t in zip(keys, texts) if k not in found)
+    """
+
+    def __init__(self, path, max_bytes=DEFAULT_MAX_BYTES):
+        self.path = str(path)
+        self.max_bytes = max_bytes
+        self.db = sqlite3.connect(self.path)
+        self.db.execute("CREATE TABLE IF NOT EXISTS results ("
+                        "key BLOB PRIMARY KEY, value BLOB NOT NULL, "
+                        "size INTEGER NOT NULL, used INTEGER NOT NULL)")
+        self.db.execute("CREATE INDEX IF NOT EXISTS results_used ON results (used)")
+        self.size = self.db.execute("SELECT COALESCE(SUM(size), 0) FROM results").fetchone()[0]
+        self.hits = self.misses = 0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def __len__(self):
+        return self.db.execute("SELECT COUNT(*) FROM results").fetchone()[0]
+
+    def get_many(self, keys):
+        """{key: result} for the keys that are cached; refreshes their stamps."""
+        keys = list(keys)
+        found = {}
+        for i in range(0, len(keys), _BATCH):
+            batch = keys[i:i + _BATCH]
+            rows = self.db.execute(
+                f"SELECT key, value FROM results WHERE key IN ({','.join('?' * len(batch))})", batch)
+            found.update((key, pickle.loads(value)) for key, value in rows)
+        if found:
+            now = time.time_ns()
+            self.db.executemany("UPDATE results SET used = ? WHERE key = ?",
+                                ((now, key) for key in found))
+            self.db.commit()
+        self.hits += len(found)
+        self.misses += len(keys) - len(found)
+        return found
+
+    def put_many(self, items):
+        """Stores (key, result) pairs, then evicts down to max_bytes."""
+        now = time.time_ns()
+        # A repeated key (the same verse text twice in a shard) is stored once
+        rows = [(key, pickle.dumps(value, pickle.HIGHEST_PROTOCOL)) for key, value in dict(items).items()]
+        if not rows:
+            return
+        keys = [key for key, _ in rows]
+        for i in range(0, len(keys), _BATCH):
+            batch = keys[i:i + _BATCH]
+            self.size -= self.db.execute(
+                f"SELECT COALESCE(SUM(size), 0) FROM results WHERE key IN ({','.join('?' * len(batch))})",
+                batch).fetchone()[0]
+        self.db.executemany("INSERT OR REPLACE INTO results VALUES (?, ?, ?, ?)",
+                            ((key, value, len(value), now) for key, value in rows))
+        self.size += sum(len(value) for _, value in rows)
+        self.evict()
+        self.db.commit()
+
+    def evict(self):
+        """Drops least recently used entries until the cache fits max_bytes."""
+        if self.size <= self.max_bytes:
+            return
+        excess = self.size - self.max_bytes
+        doomed = []
+        for key, size in self.db.execute("SELECT key, size FROM results ORDER BY used"):
+            if excess <= 0:
+                break
+            doomed.append((key,))
+            excess -= size
+            self.size -= size
+        self.db.executemany("DELETE FROM results WHERE key = ?", doomed)
+
+    def clear(self):
+        self.db.execute("DELETE FROM results")
+        self.db.commit()
+        self.size = 0
+
+    def close(self):
+        self.db.close()
@@ -0,0 +1,196 @@
+"""
+Columnar result files instead of print-formatted text.
+
+One row per verse: chapter, verse, letter_count, sum, product_log10,
+inverse_sum and the product columns of the analyze --mode the results were
+computed with (PRODUCT_COLUMNS), so an overflowing float product is never
+written for a log, exact or mod run:
+
+- float:       product, inverse_product (float64, the old inf / 0.0)
+- log, exact:  product_mantissa, product_exponent and the same for the
+               inverse, derived from the log10 of the product
+- mod:         product_residue, inverse_product_residue, product_modulus
+
+The ragged per-verse vectors are stored as a flat array plus offsets, so
+verse i's values are values[value_offsets[i]:value_offsets[i + 1]] (same
+for ratios).
+
+Formats, chosen by the path:
+- a directory (no suffix): one .npy file per column, memory-mapped on read
+- .npz:                    all columns in one NumPy archive
+- .parquet / .arrow:       via pyarrow, if it is installed (ragged columns
+                           become list<> columns)
+"""
+
+import math
+import os
+
+import numpy as np
+
+from .batch import segment_reduce
+from .products import PRODUCT_MODES, LogProduct
+
+try:
+    import pyarrow as pa
+    import pyarrow.ipc
+    import pyarrow.parquet
+except ImportError:  # pyarrow is optional
+    pa = None
+
+_LOG_COLUMNS = ("product_mantissa", "product_exponent",
+                "inverse_product_mantissa", "inverse_product_exponent")
+PRODUCT_COLUMNS = {
+    "float": ("product", "inverse_product"),
+    "log": _LOG_COLUMNS,
+    "exact": _LOG_COLUMNS,
+    "mod": ("product_residue", "inverse_product_residue", "product_modulus"),
+}
+COLUMN_TYPES = {
+    "product": np.float64, "inverse_product": np.float64,
+    "product_mantissa": np.float64, "product_exponent": np.int64,
+    "inverse_product_mantissa": np.float64, "inverse_product_exponent": np.int64,
+    "product_residue": np.int64, "inverse_product_residue": np.int64, "product_modulus": np.int64,
+}
+BASE_COLUMNS = ("chapter", "verse", "letter_count", "sum", "product_log10", "inverse_sum")
+RAGGED_COLUMNS = ("values", "ratios")
+
+
+def _log_fields(product, inverse):
+    # An exact product is a (big) int; math.log10 takes it without overflow
+    if not isinstance(product, LogProduct):
+        product = LogProduct.from_log10(math.log10(product) if product else -math.inf)
+        inverse = product.inverse() if product.log10 != -math.inf else "infinity"
+    if inverse == "infinity":
+        inverse = LogProduct(math.inf, math.inf, 0)
+    return product.mantissa, product.exponent, inverse.mantissa, inverse.exponent
+
+
+def _product_fields(product, inverse, mode):
+    """The PRODUCT_COLUMNS[mode] entries of one verse."""
+    if mode == "float":
+        return float(product), math.inf if inverse == "infinity" else float(inverse)
+    if mode == "mod":
+        # A residue without an inverse is marked -1
+        return product.residue, -1 if inverse == "infinity" else inverse.residue, product.modulus
+    return _log_fields(product, inverse)
+
+
+def build_columns(metrics, mode="float"):
+    """Turns an iterable of VerseMetrics (or anything with chapter, verse,
+    values, product, inverse_product and ratios attributes) computed with
+    product mode `mode` into a dict of NumPy columns."""
+    if mode not in PRODUCT_MODES:
+        raise ValueError(f"unknown product mode {mode!r}; choose from {', '.join(PRODUCT_MODES)}")
+    chapters, verses, values, ratios, products = [], [], [], [], []
+    for m in metrics:
+        chapters.append(m.chapter)
+        verses.append(m.verse)
+        values.append(np.asarray(m.values, dtype=np.int64))
+        ratios.append(np.asarray(m.ratios, dtype=np.float64))
+        products.append(_product_fields(m.product, m.inverse_product, mode))
+
+    counts = np.fromiter(map(len, values), dtype=np.int64, count=len(values))
+    value_offsets = np.zeros(len(values) + 1, dtype=np.int64)
+    np.cumsum(counts, out=value_offsets[1:])
+    ratio_offsets = np.zeros(len(ratios) + 1, dtype=np.int64)
+    np.cumsum([len(r) for r in ratios], out=ratio_offsets[1:])
+    flat = np.concatenate(values) if values else np.zeros(0, dtype=np.int64)
+
+    sums = segment_reduce(np.add, flat, value_offsets, 0)
+    with np.errstate(divide="ignore"):
+        product_log10 = segment_reduce(np.add, np.log10(flat.astype(np.float64)), value_offsets, 0.0)
+        inverse_sum = np.where(sums != 0, 1.0 / np.where(sums != 0, sums, 1), np.inf)
+
+    columns = {
+        "chapter": np.asarray(chapters, dtype=np.int32),
+        "verse": np.asarray(verses, dtype=np.int32),
+        "letter_count": counts,
+        "sum": sums,
+        "product_log10": product_log10,
+        "inverse_sum": inverse_sum,
+    }
+    names = PRODUCT_COLUMNS[mode]
+    fields = zip(*products) if products else [()] * len(names)
+    for name, field in zip(names, fields):
+        columns[name] = np.asarray(field, dtype=COLUMN_TYPES[name])
+    columns.update({
+        "value_offsets": value_offsets,
+        "values": flat,
+        "ratio_offsets": ratio_offsets,
+        "ratios": np.concatenate(ratios) if ratios else np.zeros(0, dtype=np.float64),
+    })
+    return columns
+
+
+def _scalar_names(names):
+    return [name for name in names if name not in RAGGED_COLUMNS and not name.endswith("_offsets")]
+
+
+def _arrow_table(columns):
+    table = {name: columns[name] for name in _scalar_names(columns)}
+    for name in RAGGED_COLUMNS:
+        offsets = pa.array(columns[name[:-1] + "_offsets"], type=pa.int64())
+        table[name] = pa.LargeListArray.from_arrays(offsets, pa.array(columns[name]))
+    return pa.table(table)
+
+
+def write_columns(path, columns):
+    path = str(path)
+    if path.endswith(".npz"):
+        np.savez(path, **columns)
+    elif path.endswith((".parquet", ".arrow", ".feather")):
+        if pa is None:
+            raise ImportError(f"writing {path} needs pyarrow; use a .npz file or a directory instead")
+        table = _arrow_table(columns)
+        if path.endswith(".parquet"):
+            pa.parquet.write_table(table, path)
+        else:
+            with pa.ipc.new_file(path, table.schema) as writer:
+                writer.write_table(table)
+    else:
+        os.makedirs(path, exist_ok=True)
+        # Columns of an earlier write (another --mode) would be read back
+        # alongside the new ones, so they are removed
+        for name in os.listdir(path):
+            if name.endswith(".npy") and name[:-4] not in columns:
+                os.remove(os.path.join(path, name))
+        for name, column in columns.items():
+            np.save(os.path.join(path, name + ".npy"), column)
+
+
+def write_results(path, metrics, mode="float"):
+    """Writes VerseMetrics records (see gematria.analyze) computed with `mode` to `path`."""
+    write_columns(path, build_columns(metrics, mode))
+
+
+def _from_arrow_table(table):
+    columns = {name: table[name].to_numpy() for name in _scalar_names(table.column_names)}
+    for name in RAGGED_COLUMNS:
+        array = table[name].combine_chunks()
+        columns[name[:-1] + "_offsets"] = array.offsets.to_numpy()
+        columns[name] = array.values.to_numpy()
+    return columns
+
+
+def read_results(path):
+    """
+    Reads a result file back as a dict of arrays. Directories and .arrow
+    files are memory-mapped, .npz files are loaded lazily per column.
+    """
+    path = str(path)
+    if path.endswith(".npz"):
+        return np.load(path)
+    if path.endswith((".parquet", ".arrow", ".feather")):
+        if pa is None:
+            raise ImportError(f"reading {path} needs pyarrow")
+        if path.endswith(".parquet"):
+            return _from_arrow_table(pa.parquet.read_table(path))
+        return _from_arrow_table(pa.ipc.open_file(pa.memory_map(path)).read_all())
+    return {name[:-4]: np.load(os.path.join(path, name), mmap_mode="r")
+            for name in os.listdir(path) if name.endswith(".npy")}
+
+
+def ragged(columns, name, i):
+    """Verse i's slice of the ragged column `name` ('values' or 'ratios')."""
+    offsets = columns[name[:-1] + "_offsets"]
+    return columns[name][offsets[i]:offsets[i + 1]]
@@ -0,0 +1,173 @@
+"""
+Streaming corpus readers.
+
+Both readers yield (chapter_index, verse_index, text) records one at a time
+and only keep a bounded read buffer in memory, so full Tanakh-sized dumps can
+be processed the same way as the 70-line Sefer Yetzirah file.
+
+- JSON files in the sefer_yetzirah.json layout: {"text": [[verse, ...], ...]}
+  (a flat {"text": [verse, ...]} list is read as chapter 0).
+- Plain line files like sefer_yetzirah-he.txt: one verse per line, blank
+  lines start a new chapter, and lines written as ["..."], (as in
+  sh-heb-final-2.txt) are unwrapped.
+"""
+
+import json
+import re
+
+CHUNK_SIZE = 1 << 16
+
+_STRING = re.compile(r'"(?:[^"\\]|\\.)*"', re.S)
+_SCALAR = re.compile(r'[^\s,:\[\]{}"]+')
+
+
+def _json_events(f, chunk_size=CHUNK_SIZE):
+    """
+    Minimal incremental JSON tokenizer.
+    Yields (event, value) with event in start_map, end_map, start_array,
+    end_array, key, string, scalar.
+    """
+    buf = ""
+    pos = 0
+    eof = False
+    stack = []  # [is_map, expecting_key] per open container
+
+    def value_done():
+        if stack and stack[-1][0]:
+            stack[-1][1] = True
+
+    while True:
+        while pos < len(buf) and buf[pos] in " \t\r\n,:":
+            pos += 1
+        if pos >= len(buf) or (not eof and len(buf) - pos < 64):
+            if not eof:
+                chunk = f.read(chunk_size)
+                eof = chunk == ""
+                buf = buf[pos:] + chunk
+                pos = 0
+                continue
+            if pos >= len(buf):
+                return
+        char = buf[pos]
+        if char in "[{":
+            is_map = char == "{"
+            stack.append([is_map, True])
+            pos += 1
+            yield ("start_map" if is_map else "start_array"), None
+        elif char in "]}":
+            stack.pop()
+            pos += 1
+            yield ("end_map" if char == "}" else "end_array"), None
+            value_done()
+        elif char == '"':
+            match = _STRING.match(buf, pos)
+            if match is None:
+                if eof:
+                    raise ValueError("unterminated string in JSON corpus")
+                chunk = f.read(chunk_size)
+                eof = chunk == ""
+                buf = buf[pos:] + chunk
+                pos = 0
+                continue
+            pos = match.end()
+            text = json.loads(match.group())
+            if stack and stack[-1][0] and stack[-1][1]:
+                stack[-1][1] = False
+                yield "key", text
+            else:
+                yield "string", text
+                value_done()
+        else:
+            match = _SCALAR.match(buf, pos)
+            if match is None:
+                raise ValueError(f"unexpected character {char!r} in JSON corpus")
+            if match.end() == len(buf) and not eof:
+                chunk = f.read(chunk_size)
+                eof = chunk == ""
+                buf = buf[pos:] + chunk
+                pos = 0
+                continue
+            pos = match.end()
+            yield "scalar", json.loads(match.group())
+            value_done()
+
+
+def iter_json_verses(path, key="text", chunk_size=CHUNK_SIZE):
+    """Yields (chapter_index, verse_index, text) from a {"text": [[...]]} file."""
+    with open(path, "r", encoding="utf-8") as f:
+        depth = 0           # nesting depth of the whole document
+        in_text = False     # inside the top-level "text" value
+        text_depth = 0      # array depth below "text"
+        pending_key = None
+        chapter = verse = -1
+        for event, value in _json_events(f, chunk_size):
+            if event == "key":
+                pending_key = value if depth == 1 else None
+                continue
+            if not in_text:
+                if event in ("start_map", "start_array"):
+                    if pending_key == key and event == "start_array":
+                        in_text = True
+                        text_depth = 1
+                        chapter = verse = -1
+                    depth += 1
+                elif event in ("end_map", "end_array"):
+                    depth -= 1
+                pending_key = None
+                continue
+
+            if event == "start_array":
+                text_depth += 1
+                depth += 1
+                if text_depth == 2:
+                    chapter += 1
+                    verse = -1
+                else:
+                    raise ValueError("verses nested deeper than [[...]] are not supported")
+            elif event == "end_array":
+                text_depth -= 1
+                depth -= 1
+                if text_depth == 0:
+                    in_text = False
+            elif event == "string":
+                verse += 1
+                if text_depth == 1:
+                    yield 0, verse, value
+                else:
+                    yield chapter, verse, value
+            elif event == "start_map":
+                raise ValueError("objects inside the text array are not supported")
+
+
+def iter_line_verses(path):
+    """Yields (chapter_index, verse_index, text) from a one-verse-per-line file."""
+    with open(path, "r", encoding="utf-8") as f:
+        chapter, verse = 0, 0
+        for line in f:
+            line = line.strip()
+            if not line:
+                if verse:
+                    chapter, verse = chapter + 1, 0
+                continue
+            texts = [line]
+            if line.startswith("["):
+                try:
+                    texts = json.loads(line.rstrip(","))
+                except ValueError:
+                    pass
+            for text in texts:
+                yield chapter, verse, text
+                verse += 1
+
+
+def iter_verses(path, normalize=False):
+    """
+    Picks the reader by file extension (.json or line file). With
+    `normalize` the texts go through gematria.normalize (niqqud, te'amim,
+    tashkeel and Greek accents stripped, maqaf as a word break).
+    """
+    records = iter_json_verses(path) if str(path).endswith(".json") else iter_line_verses(path)
+    if normalize:
+        from .normalize import normalized  # needs NumPy; the readers do not
+        return normalized(records)
+    return records
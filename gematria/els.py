@@ -0,0 +1,189 @@
+"""
+Equidistant letter sequence (ELS) search.
+
+The corpus is reduced to one letter stream: every letter that has a value,
+spaces and punctuation stripped, final forms folded to their base letter,
+as a uint32 codepoint array. A term with skip d starting at p matches when
+stream[p + i * d] == term[i] for every i. The scan starts from the
+positions of the term's first letter and filters them letter by letter,
+for a whole block of skips at once (a positions x skips matrix), so there
+is no Python loop per position or per skip. Skip ranges can be split
+across a process pool.
+
+Usage:
+    python -m gematria.els sefer_yetzirah.json תורה [--min-skip 2]
+        [--max-skip 1000] [--workers N] [--both-directions]
+"""
+
+import argparse
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import NamedTuple
+
+import numpy as np
+
+from .batch import encode_corpus, map_values, segment_reduce
+from .corpus import iter_verses
+from .systems import SYSTEMS, lookup
+from .tables import FINAL_TO_STANDARD
+
+# Upper bound on positions x skips per block, to cap memory
+BLOCK_ELEMENTS = 1 << 22
+
+
+class LetterStream(NamedTuple):
+    letters: np.ndarray  # uint32 codepoints, letters with a value only
+    offsets: np.ndarray  # verse i's letters are letters[offsets[i]:offsets[i + 1]]
+
+
+class ElsHits(NamedTuple):
+    start: np.ndarray  # stream position of the term's first letter
+    skip: np.ndarray   # negative for matches read backwards
+
+
+def fold_finals(codepoints):
+    """Final forms -> base letters, on a codepoint array."""
+    folded = codepoints.copy()
+    for final, base in FINAL_TO_STANDARD.items():
+        folded[codepoints == ord(final)] = ord(base)
+    return folded
+
+
+def letter_stream(verses, system="hechrachi", finals=False) -> LetterStream:
+    """The space-stripped letter stream of a corpus; finals are folded unless `finals`."""
+    codepoints, offsets = encode_corpus(verses)
+    folded = fold_finals(codepoints)
+    # Finals are letters even where the system gives them no value (standard)
+    known = map_values(folded, lookup(system)) != 0
+    counts = segment_reduce(np.add, known.astype(np.int64), offsets, 0)
+    kept_offsets = np.zeros(len(offsets), dtype=np.int64)
+    np.cumsum(counts, out=kept_offsets[1:])
+    return LetterStream((codepoints if finals else folded)[known], kept_offsets)
+
+
+def encode_term(term, finals=False):
+    codepoints = np.frombuffer("".join(term.split()).encode("utf-32-le"), dtype="<u4")
+    return codepoints if finals else fold_finals(codepoints)
+
+
+def scan_skips(stream, term, skips):
+    """
+    Matches of the encoded `term` in `stream` for every skip in `skips`
+    (positive skips only). Returns (starts, skips) arrays.
+    """
+    stream = np.asarray(stream)
+    term = np.asarray(term)
+    skips = np.asarray(skips, dtype=np.int64)
+    k, n = len(term), len(stream)
+    if k == 0 or n == 0 or len(skips) == 0:
+        return np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.int64)
+    first = np.flatnonzero(stream == term[0])
+
+    starts, found_skips = [], []
+    block = max(1, BLOCK_ELEMENTS // max(len(first), 1))
+    for b in range(0, len(skips), block):
+        d = skips[b:b + block]
+        # Candidate (position, skip) pairs whose last letter still lies in the stream
+        pos = np.broadcast_to(first[:, None], (len(first), len(d)))
+        fits = pos + (k - 1) * d[None, :] < n
+        p, s = pos[fits], np.broadcast_to(d[None, :], fits.shape)[fits]
+        for i in range(1, k):
+            match = stream[p + i * s] == term[i]
+            p, s = p[match], s[match]
+        starts.append(p)
+        found_skips.append(s)
+    return np.concatenate(starts), np.concatenate(found_skips)
+
+
+_worker_stream = None
+
+
+def _init_worker(stream):
+    global _worker_stream
+    _worker_stream = stream
+
+
+def _scan_chunk(term, skips):
+    return scan_skips(_worker_stream, term, skips)
+
+
+def search_els(stream, term, min_skip=1, max_skip=None, both_directions=False,
+               workers=None, chunk_skips=256) -> ElsHits:
+    """
+    All ELS occurrences of `term` with min_skip <= skip <= max_skip
+    (default: the longest skip that still fits). `stream` is a LetterStream
+    or an encoded letter array, `term` a string. With both_directions the
+    reversed reading is searched as well and reported with negative skips
+    (start is still the position of the term's first letter). workers > 1
+    splits the skip range across a process pool. A term needs at least two
+    letters; a single letter would match once per skip.
+    """
+    letters = stream.letters if isinstance(stream, LetterStream) else np.asarray(stream)
+    encoded = encode_term(term) if isinstance(term, str) else np.asarray(term)
+    k = len(encoded)
+    if k < 2:
+        raise ValueError(f"an ELS term needs at least two letters, got {k}")
+    if max_skip is None:
+        max_skip = (len(letters) - 1) // max(k - 1, 1)
+    skips = np.arange(max(min_skip, 1), max_skip + 1, dtype=np.int64)
+
+    terms = [(encoded, 1)]
+    if both_directions:
+        terms.append((encoded[::-1], -1))
+
+    if workers and workers > 1:
+        chunks = [skips[i:i + chunk_skips] for i in range(0, len(skips), chunk_skips)]
+        with ProcessPoolExecutor(workers, initializer=_init_worker, initargs=(letters,)) as pool:
+            results = [(sign, list(pool.map(_scan_chunk, [pattern] * len(chunks), chunks)))
+                       for pattern, sign in terms]
+    else:
+        results = [(sign, [scan_skips(letters, pattern, skips)]) for pattern, sign in terms]
+
+    starts, found_skips = [], []
+    for sign, parts in results:
+        for p, s in parts:
+            # A backward match is found at its last letter; report the first
+            starts.append(p if sign > 0 else p + (k - 1) * s)
+            found_skips.append(sign * s)
+
+    start = np.concatenate(starts) if starts else np.zeros(0, dtype=np.int64)
+    skip = np.concatenate(found_skips) if found_skips else np.zeros(0, dtype=np.int64)
+    order = np.lexsort((start, np.abs(skip)))
+    return ElsHits(start[order], skip[order])
+
+
+def locate(offsets, positions):
+    """(verse index, letter index in the verse) for stream positions."""
+    verse = np.searchsorted(offsets, positions, "right") - 1
+    return verse, positions - offsets[verse]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("corpus")
+    parser.add_argument("term")
+    parser.add_argument("--min-skip", type=int, default=1)
+    parser.add_argument("--max-skip", type=int, default=None)
+    parser.add_argument("--both-directions", action="store_true")
+    parser.add_argument("--system", choices=list(SYSTEMS), default="hechrachi")
+    parser.add_argument("--workers", type=int, default=os.cpu_count())
+    parser.add_argument("--normalize", action="store_true",
+                        help="strip niqqud, te'amim, tashkeel and Greek accents first")
+    args = parser.parse_args(argv)
+
+    records = list(iter_verses(args.corpus, args.normalize))
+    stream = letter_stream([text for _, _, text in records], args.system)
+    try:
+        hits = search_els(stream, args.term, args.min_skip, args.max_skip,
+                          args.both_directions, args.workers)
+    except ValueError as e:
+        parser.error(str(e))
+    verses, letters = locate(stream.offsets, hits.start)
+    for start, skip, verse, letter in zip(hits.start.tolist(), hits.skip.tolist(),
+                                          verses.tolist(), letters.tolist()):
+        chapter, number, _ = records[verse]
+        print(f"skip {skip}\tstart {start}\t{chapter}:{number} letter {letter}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,142 @@
+"""
+Precompiled gematria engine.
+
+The old scripts looked every character up in a freshly built dict and ran
+`unicodedata.normalize` on it. GematriaEngine does that work once: it folds
+every codepoint of the relevant Unicode blocks to its base letter at
+construction time and keeps the result in a flat char -> value table, so
+scoring a string is a single pass over it.
+"""
+
+import unicodedata
+from collections import Counter
+from itertools import repeat
+
+from .tables import FINAL_TO_STANDARD, MULTI_SCRIPT_VALUES
+
+# Blocks that are folded eagerly when an engine is built. Anything outside
+# these ranges is folded lazily the first time it shows up in a text.
+FOLD_RANGES = (
+    (0x0000, 0x0250),  # Basic Latin .. Latin Extended-B
+    (0x0300, 0x0400),  # Combining marks, Greek and Coptic
+    (0x0590, 0x0700),  # Hebrew, Arabic
+    (0x1E00, 0x2000),  # Latin Extended Additional, Greek Extended
+    (0xFB1D, 0xFB50),  # Hebrew presentation forms
+)
+
+# Unicode categories that count 0 in every system: punctuation (P*),
+# separators (Z*), control and format characters, combining marks
+ZERO_CATEGORIES = ("Pc", "Pd", "Ps", "Pe", "Pi", "Pf", "Po", "Zs", "Zl", "Zp",
+                   "Cc", "Cf", "Mn", "Mc", "Me")
+
+
+def counts_zero(char, values):
+    """
+    True for a character that counts 0 by design under table `values`
+    instead of being unknown: whitespace, ZERO_CATEGORIES and final forms
+    whose base letter is in the table (standard gives ם ן ך ף ץ no value).
+    """
+    if char.isspace() or unicodedata.category(char) in ZERO_CATEGORIES:
+        return True
+    return FINAL_TO_STANDARD.get(char) in values
+
+
+def strip_diacritics(text):
+    """
+    Removes diacritics from Unicode characters to get the base letter.
+    """
+    return ''.join(char for char in unicodedata.normalize('NFD', text)
+                   if unicodedata.category(char) != 'Mn')
+
+
+class GematriaEngine:
+    """
+    Scores strings against a letter -> value table.
+
+    Characters are folded the way gematria-sum.py always did it: NFD with
+    combining marks dropped, and the folded letter itself must be in the
+    table (so an unlisted capital such as X is unknown, not x). Characters
+    for which counts_zero holds (punctuation, whitespace, marks, unvalued
+    finals) count as 0; other characters that cannot be folded to a table
+    entry count as 0 and are tallied in `unknown_counts`, so a caller can
+    report them once instead of once per occurrence. With strict=True they
+    raise ValueError instead.
+    """
+
+    def __init__(self, values=MULTI_SCRIPT_VALUES, strict=False):
+        self.values = dict(values)
+        self.strict = strict
+        self.unknown_counts = Counter()
+        self._table = {}
+        # Table keys go through the same folding: 'Á' folds to 'A', which
+        # is not in the table, so it stays unknown as it always was
+        for letter in self.values:
+            if len(letter) == 1:
+                value = self._fold(letter)
+                if value is not None:
+                    self._table[letter] = value
+        for start, end in FOLD_RANGES:
+            for codepoint in range(start, end):
+                char = chr(codepoint)
+                if char not in self._table:
+                    value = self._fold(char)
+                    if value is not None:
+                        self._table[char] = value
+        # translate() map that deletes every known character; whatever is
+        # left after translating a text still needs to be resolved.
+        self._known = dict.fromkeys(map(ord, self._table))
+
+    def _fold(self, char):
+        """Resolves a character that is not in the table directly, or None."""
+        if char.strip() == "":
+            return 0
+        base = strip_diacritics(char)
+        if base == "":
+            return 0
+        if base in self.values:
+            return self.values[base.lower()]
+        return 0 if counts_zero(char, self.values) else None
+
+    def _resolve(self, char):
+        value = self._fold(char)
+        if value is None:
+            if self.strict:
+                raise ValueError(f"Unbekanntes Zeichen '{char}' (U+{ord(char):04X})")
+            self.unknown_counts[char] += 1
+            return 0
+        if len(char) == 1:
+            self._table[char] = value
+            self._known[ord(char)] = None
+        return value
+
+    def unknown(self, text: str) -> Counter:
+        """Counts the characters of `text` that have no value (per verse)."""
+        residue = Counter(text.translate(self._known))
+        return Counter({char: n for char, n in residue.items() if self._fold(char) is None})
+
+    def knows(self, char: str) -> bool:
+        """True if `char` has a value or counts 0 by design (is not unknown)."""
+        return char in self._table or self._fold(char) is not None
+
+    def letter_value(self, char: str) -> int:
+        """Returns the value of a single character."""
+        value = self._table.get(char)
+        if value is None:
+            return self._resolve(char)
+        return value
+
+    def score(self, text: str) -> int:
+        """Returns the gematria sum of `text` in one pass over the table."""
+        total = sum(map(self._table.get, text, repeat(0)))
+        residue = text.translate(self._known)
+        if residue:
+            total += sum(map(self._resolve, residue))
+        return total
+
+
+def format_unknown(counts, limit=20):
+    """Lists a Counter of unknown characters, most frequent first."""
+    listed = [f"'{char}' (U+{ord(char):04X}) {n}x" for char, n in counts.most_common(limit)]
+    if len(counts) > limit:
+        listed.append(f"... {len(counts) - limit} more")
+    return ", ".join(listed)
@@ -0,0 +1,98 @@
+"""
+Headless batch export of Sefer Yetzirah diagrams.
+
+One image per item, all rendered with a single reused DiagramRenderer:
+
+- verses:    the letter path of each verse of a corpus (finals folded to
+             their standard letter), shaded from start to end
+- triplets:  each line of a triplet file (e.g. sh-heb-final-2.txt) as its
+             set of 3-letter paths
+- orderings: the 72 triplets drawn on every rotation of the letter ring,
+             or on the orderings listed one per line in a file
+
+Usage:
+    python -m gematria.export OUTDIR verses sefer_yetzirah.json
+    python -m gematria.export OUTDIR triplets sh-heb-final-2.txt --format svg
+    python -m gematria.export OUTDIR orderings [orderings.txt] --triplets sh-heb-final-2.txt
+"""
+
+import argparse
+import os
+
+from .corpus import iter_line_verses, iter_verses
+from .render import DiagramRenderer
+from .tables import FINAL_TO_STANDARD, LETTERS_22
+
+
+def verse_path(text):
+    """The letters of a verse on the 22-letter ring, finals folded."""
+    letters = set(LETTERS_22)
+    folded = (FINAL_TO_STANDARD.get(char, char) for char in text)
+    return [char for char in folded if char in letters]
+
+
+def export_verses(renderer, corpus, outdir, fmt):
+    for chapter, verse, text in iter_verses(corpus):
+        path = verse_path(text)
+        name = f"verse-{chapter:03d}-{verse:03d}.{fmt}"
+        renderer.draw([path], os.path.join(outdir, name),
+                      title=f"Verse {chapter + 1}:{verse + 1} ({len(path)} letters)",
+                      color_by='step')
+        yield name
+
+
+def export_triplets(renderer, triplet_file, outdir, fmt):
+    for chapter, line, text in iter_line_verses(triplet_file):
+        triplets = text.split()
+        name = f"triplets-{chapter:03d}-{line:03d}.{fmt}"
+        renderer.draw(triplets, os.path.join(outdir, name),
+                      title=f"{len(triplets)} triplets")
+        yield name
+
+
+def export_orderings(renderer, orderings, triplets, outdir, fmt):
+    for i, ordering in enumerate(orderings):
+        renderer.set_ordering(ordering)
+        name = f"ordering-{i:03d}.{fmt}"
+        renderer.draw(triplets, os.path.join(outdir, name),
+                      title=f"Ordering {i}: {''.join(ordering)}")
+        yield name
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0].strip())
+    parser.add_argument("outdir")
+    parser.add_argument("kind", choices=("verses", "triplets", "orderings"))
+    parser.add_argument("source", nargs="?",
+                        help="corpus (verses), triplet file (triplets) or ordering file (orderings)")
+    parser.add_argument("--triplets", default="sh-heb-final-2.txt",
+                        help="triplet file whose first line is drawn for orderings")
+    parser.add_argument("--format", default="png", help="png, svg, pdf, ...")
+    args = parser.parse_args(argv)
+
+    os.makedirs(args.outdir, exist_ok=True)
+    renderer = DiagramRenderer()
+    if args.kind == "verses":
+        names = export_verses(renderer, args.source or "sefer_yetzirah.json", args.outdir, args.format)
+    elif args.kind == "triplets":
+        names = export_triplets(renderer, args.source or "sh-heb-final-2.txt", args.outdir, args.format)
+    else:
+        if args.source:
+            with open(args.source, "r", encoding="utf-8") as f:
+                orderings = [list(line.strip()) for line in f if line.strip()]
+        else:
+            orderings = [LETTERS_22[i:] + LETTERS_22[:i] for i in range(len(LETTERS_22))]
+        for number, ordering in enumerate(orderings, 1):
+            if len(ordering) != len(renderer.letters):
+                parser.error(f"ordering {number} has {len(ordering)} letters, "
+                             f"the ring has {len(renderer.letters)}")
+        triplets = next(iter_line_verses(args.triplets))[2].split()
+        names = export_orderings(renderer, orderings, triplets, args.outdir, args.format)
+
+    count = sum(1 for _ in names)
+    renderer.close()
+    print(f"{count} diagrams written to {args.outdir}")
+
+
+if __name__ == "__main__":
+    main()
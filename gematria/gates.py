@@ -0,0 +1,199 @@
+"""
+Gates: k-letter combinations and permutations of an alphabet.
+
+Gates is a lazy, indexable replacement for list(itertools.combinations(...))
+and list(itertools.permutations(...)). Any gate can be computed from its
+index (unranking) and vice versa, so ranges of gates can be handed to
+worker processes without enumerating what comes before them. The order is
+the same as itertools produces.
+
+GateMatrices holds the 231 Gates as precomputed 22x22 matrices.
+gates_numeric_analysis used to re-sum the spelled-out letter names three
+times per gate. GateMatrices computes the letter values and name values of
+an alphabet once and derives every pairwise sum, name ratio and name
+difference as an outer operation, so analysing any set of gates (231
+combinations, 462 permutations, or larger alphabets) is a matrix lookup.
+"""
+
+import itertools
+from math import comb, perm
+
+import numpy as np
+
+
+class Gates:
+    """
+    The k-letter gates of `letters`, in itertools order.
+
+    Gates(letters)                  -> 231 pairs for the 22 letters
+    Gates(letters, ordered=True)    -> 462 ordered pairs
+    Gates(letters, 3, ordered=True) -> 9240 ordered triplets
+    Gates(letters, 4)               -> 7315 four-letter combinations
+
+    Supports len(), iteration, gates[i], gates[a:b] and gates.index(gate).
+    """
+
+    def __init__(self, letters, k=2, ordered=False):
+        self.letters = list(letters)
+        self.k = k
+        self.ordered = ordered
+        self._position = {letter: i for i, letter in enumerate(self.letters)}
+        n = len(self.letters)
+        self._len = perm(n, k) if ordered else comb(n, k)
+
+    def __len__(self):
+        return self._len
+
+    def __repr__(self):
+        kind = "permutations" if self.ordered else "combinations"
+        return f"Gates({len(self.letters)} letters, k={self.k}, {kind}, {self._len} gates)"
+
+    def __iter__(self):
+        if self.ordered:
+            return itertools.permutations(self.letters, self.k)
+        return itertools.combinations(self.letters, self.k)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            start, stop, step = index.indices(self._len)
+            if step != 1:
+                return [self[i] for i in range(start, stop, step)]
+            return list(self.iter_range(start, stop))
+        if index < 0:
+            index += self._len
+        if not 0 <= index < self._len:
+            raise IndexError("gate index out of range")
+        return self._gate(self._unrank(index))
+
+    def _gate(self, positions):
+        return tuple(self.letters[p] for p in positions)
+
+    def _unrank(self, index):
+        n, k = len(self.letters), self.k
+        positions = []
+        if self.ordered:
+            unused = list(range(n))
+            for slot in range(k):
+                block = perm(n - slot - 1, k - slot - 1)
+                choice, index = divmod(index, block)
+                positions.append(unused.pop(choice))
+        else:
+            value = 0
+            for slot in range(k):
+                while True:
+                    block = comb(n - value - 1, k - slot - 1)
+                    if index < block:
+                        break
+                    index -= block
+                    value += 1
+                positions.append(value)
+                value += 1
+        return positions
+
+    def index(self, gate) -> int:
+        """The index of `gate` (ranking); ValueError if it is not a gate."""
+        n, k = len(self.letters), self.k
+        try:
+            positions = [self._position[letter] for letter in gate]
+        except KeyError:
+            raise ValueError(f"{gate!r} is not a gate of this alphabet") from None
+        if len(positions) != k or len(set(positions)) != k:
+            raise ValueError(f"{gate!r} is not a gate of this alphabet")
+        rank = 0
+        if self.ordered:
+            unused = list(range(n))
+            for slot, p in enumerate(positions):
+                rank += unused.index(p) * perm(n - slot - 1, k - slot - 1)
+                unused.remove(p)
+        else:
+            if positions != sorted(positions):
+                raise ValueError(f"{gate!r} is not in combination order")
+            previous = -1
+            for slot, p in enumerate(positions):
+                for value in range(previous + 1, p):
+                    rank += comb(n - value - 1, k - slot - 1)
+                previous = p
+        return rank
+
+    def iter_range(self, start, stop):
+        """
+        Lazily yields gates start..stop-1: the first one is unranked, the
+        rest follow by successor steps, so chunks can be processed in parallel.
+        """
+        stop = min(stop, self._len)
+        if start >= stop:
+            return
+        positions = self._unrank(start)
+        n, k = len(self.letters), self.k
+        for _ in range(stop - start):
+            yield self._gate(positions)
+            if self.ordered:
+                # Next k-permutation: bump the rightmost slot that has a
+                # larger unused value, then fill the tail in ascending order.
+                for slot in range(k - 1, -1, -1):
+                    used = set(positions[:slot])
+                    bigger = [v for v in range(positions[slot] + 1, n) if v not in used]
+                    if bigger:
+                        positions[slot] = bigger[0]
+                        used.add(bigger[0])
+                        tail = [v for v in range(n) if v not in used]
+                        positions[slot + 1:] = tail[:k - slot - 1]
+                        break
+            else:
+                for slot in range(k - 1, -1, -1):
+                    if positions[slot] < n - k + slot:
+                        positions[slot] += 1
+                        for j in range(slot + 1, k):
+                            positions[j] = positions[j - 1] + 1
+                        break
+
+    def chunks(self, size):
+        """(start, stop) index ranges covering all gates, for worker pools."""
+        return [(start, min(start + size, self._len)) for start in range(0, self._len, size)]
+
+
+class GateMatrices:
+    """
+    Pairwise gate metrics for `letters`; row = first letter, column = second.
+
+    - sum[i, j]:        letter_value(i) + letter_value(j)
+    - name_ratio[i, j]: name_value(i) / name_value(j), 0 where the divisor is 0
+    - name_diff[i, j]:  name_value(i) - name_value(j)
+    """
+
+    def __init__(self, letters, letter_value, name_value):
+        self.letters = list(letters)
+        self.index = {letter: i for i, letter in enumerate(self.letters)}
+        self.values = np.array([letter_value(l) for l in self.letters], dtype=np.int64)
+        self.name_values = np.array([name_value(l) for l in self.letters], dtype=np.int64)
+
+        nv = self.name_values
+        self.sum = self.values[:, None] + self.values[None, :]
+        self.name_diff = nv[:, None] - nv[None, :]
+        with np.errstate(divide="ignore", invalid="ignore"):
+            self.name_ratio = np.where(nv[None, :] != 0, nv[:, None] / nv[None, :], 0.0)
+
+    def covers(self, gates) -> bool:
+        """True if every letter of every gate is part of the matrices."""
+        return all(letter in self.index for gate in gates for letter in gate)
+
+    def indices(self, gates):
+        """(rows, cols) index arrays for a sequence of 2-letter gates."""
+        idx = np.array([(self.index[a], self.index[b]) for a, b in gates],
+                       dtype=np.intp).reshape(-1, 2)
+        return idx[:, 0], idx[:, 1]
+
+    def analysis(self, gates):
+        """
+        Same records as gates_numeric_analysis: gate, basic_sum,
+        ratio_name_sum and diff_name_sum per gate.
+        """
+        gates = list(gates)
+        rows, cols = self.indices(gates)
+        sums = self.sum[rows, cols].tolist()
+        ratios = self.name_ratio[rows, cols].tolist()
+        diffs = self.name_diff[rows, cols].tolist()
+        return [
+            {'gate': gate, 'basic_sum': s, 'ratio_name_sum': r, 'diff_name_sum': d}
+            for gate, s, r, d in zip(gates, sums, ratios, diffs)
+        ]
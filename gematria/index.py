@@ -0,0 +1,168 @@
+"""
+Value -> occurrences index: every word (and phrase of up to max_words
+consecutive words) of a corpus, sorted by gematria value.
+
+The index is a handful of flat arrays, no dicts: the occurrences are sorted
+by value, so all occurrences of N are one np.searchsorted range, and the
+word texts are kept as one codepoint array with offsets. Saved as a
+directory of .npy files (see gematria.columnar) the arrays are memory-mapped
+when opened, so a query touches only the pages it needs and a full Tanakh
+index opens instantly.
+
+Usage:
+    python -m gematria.index build sefer_yetzirah.json --output sy.index
+        [--system hechrachi] [--max-words 3]
+    python -m gematria.index query sy.index 26 45 ...
+"""
+
+import argparse
+from typing import NamedTuple
+
+import numpy as np
+
+from .batch import encode_corpus, score_words
+from .columnar import read_results, write_columns
+from .corpus import iter_verses
+from .systems import SYSTEMS, lookup
+
+
+class Occurrence(NamedTuple):
+    value: int
+    chapter: int
+    verse: int
+    word: int    # position of the first word in the verse
+    length: int  # number of words
+    text: str
+
+
+def _offsets(lengths):
+    offsets = np.zeros(len(lengths) + 1, dtype=np.int64)
+    np.cumsum(lengths, out=offsets[1:])
+    return offsets
+
+
+def build_index(records, system="hechrachi", max_words=1):
+    """
+    Index columns for (chapter, verse, text) records. Words are split at
+    whitespace and maqaf; words without any letter value are left out.
+    The default system values final forms like their base letter (אלהים is
+    86); under "standard" the finals count 0.
+    """
+    chapters, verses, texts = [], [], []
+    for chapter, verse, text in records:
+        chapters.append(chapter)
+        verses.append(verse)
+        texts.append(text)
+
+    scores = score_words(texts, lookup(system))
+    word_values, verse_word_offsets = scores.values, scores.offsets
+    word_verse = np.repeat(np.arange(len(texts)), np.diff(verse_word_offsets))
+    chars, word_char_offsets = encode_corpus(scores.words)
+
+    word_prefix = _offsets(word_values)
+    first, length, value = [], [], []
+    for n in range(1, max_words + 1):
+        w = np.arange(len(word_values) - n + 1)
+        same_verse = word_verse[w] == word_verse[w + n - 1]
+        w = w[same_verse]
+        first.append(w)
+        length.append(np.full(len(w), n, dtype=np.int16))
+        value.append(word_prefix[w + n] - word_prefix[w])
+    first, length, value = map(np.concatenate, (first, length, value))
+    order = np.lexsort((length, first, value))
+
+    return {
+        "value": value[order],
+        "word": first[order],
+        "length": length[order],
+        "chars": chars,
+        "word_char_offsets": word_char_offsets,
+        "verse_word_offsets": verse_word_offsets,
+        "chapter": np.asarray(chapters, dtype=np.int32),
+        "verse": np.asarray(verses, dtype=np.int32),
+        "system": np.array(system),
+    }
+
+
+class ValueIndex:
+    """Queries over index columns from build_index, in memory or memory-mapped."""
+
+    def __init__(self, columns):
+        self.columns = columns
+        self.values = columns["value"]
+        self.system = str(columns["system"])
+
+    @classmethod
+    def build(cls, records, system="hechrachi", max_words=1):
+        return cls(build_index(records, system, max_words))
+
+    @classmethod
+    def open(cls, path):
+        """Opens a saved index; a directory is memory-mapped."""
+        return cls(read_results(path))
+
+    def save(self, path):
+        write_columns(path, self.columns)
+
+    def __len__(self):
+        return len(self.values)
+
+    def span(self, value):
+        """(start, stop) of the occurrences of `value` in the sorted arrays."""
+        return (int(np.searchsorted(self.values, value, "left")),
+                int(np.searchsorted(self.values, value, "right")))
+
+    def count(self, value):
+        start, stop = self.span(value)
+        return stop - start
+
+    def text(self, word, length=1):
+        """The words word .. word + length - 1, joined by spaces."""
+        offsets, chars = self.columns["word_char_offsets"], self.columns["chars"]
+        return " ".join(np.asarray(chars[offsets[w]:offsets[w + 1]]).tobytes().decode("utf-32-le")
+                        for w in range(word, word + length))
+
+    def find(self, value):
+        """All occurrences of `value`, in corpus order."""
+        start, stop = self.span(value)
+        words = np.asarray(self.columns["word"][start:stop])
+        lengths = np.asarray(self.columns["length"][start:stop])
+        verse_word_offsets = self.columns["verse_word_offsets"]
+        rows = np.searchsorted(verse_word_offsets, words, "right") - 1
+        chapters = np.asarray(self.columns["chapter"])[rows]
+        verses = np.asarray(self.columns["verse"])[rows]
+        positions = words - np.asarray(verse_word_offsets)[rows]
+        return [Occurrence(int(value), c, v, p, n, self.text(w, n))
+                for c, v, p, w, n in zip(chapters.tolist(), verses.tolist(), positions.tolist(),
+                                         words.tolist(), lengths.tolist())]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    commands = parser.add_subparsers(dest="command", required=True)
+    build = commands.add_parser("build")
+    build.add_argument("corpus")
+    build.add_argument("--output", required=True)
+    build.add_argument("--system", choices=list(SYSTEMS), default="hechrachi")
+    build.add_argument("--max-words", type=int, default=1)
+    build.add_argument("--normalize", action="store_true",
+                       help="strip niqqud, te'amim, tashkeel and Greek accents first")
+    query = commands.add_parser("query")
+    query.add_argument("index")
+    query.add_argument("values", nargs="+", type=int)
+    args = parser.parse_args(argv)
+
+    if args.command == "build":
+        records = iter_verses(args.corpus, args.normalize)
+        index = ValueIndex.build(records, args.system, args.max_words)
+        index.save(args.output)
+        print(f"{len(index)} occurrences -> {args.output}")
+    else:
+        index = ValueIndex.open(args.index)
+        for value in args.values:
+            for o in index.find(value):
+                print(f"{o.value}\t{o.chapter}:{o.verse}\tword {o.word}\t{o.text}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,71 @@
+"""
+Ring layouts for the diagrams, computed as NumPy arrays and cached.
+
+circle_positions used to compute cos/sin point by point on every draw, and
+each visualization rebuilt its own letter -> (x, y) dict. ring_layout
+computes a whole ring in one step and caches it by (n, radius, start_angle);
+RingLayout adds the letter -> index mapping so the coordinates of any set of
+gates or triplets come from one fancy-indexing step.
+"""
+
+from functools import lru_cache
+
+import numpy as np
+
+
+@lru_cache(maxsize=256)
+def ring_layout(num_points, radius=1.0, start_angle=0.0):
+    """
+    (num_points x 2) array of points equally spaced around a circle,
+    starting at `start_angle` degrees. The cached array is read-only.
+    """
+    angles = np.radians(start_angle + np.arange(num_points) * (360.0 / num_points))
+    xy = radius * np.column_stack([np.cos(angles), np.sin(angles)])
+    xy.setflags(write=False)
+    return xy
+
+
+def letter_indices(letters, groups):
+    """
+    Index array (len(groups) x k) of letter positions for k-letter groups
+    (gates, triplets). Groups with a letter outside `letters` are dropped.
+    """
+    position = {letter: i for i, letter in enumerate(letters)}
+    rows = [[position[l] for l in group] for group in groups
+            if all(l in position for l in group)]
+    k = len(rows[0]) if rows else 2
+    return np.array(rows, dtype=np.intp).reshape(-1, k)
+
+
+def path_segments(xy, indices):
+    """
+    Segments (m x 2 x 2) along each row of `indices`: a row (a, b, c) gives
+    the edges a->b and b->c. Gates are rows of length 2.
+    """
+    xy = np.asarray(xy, dtype=float)
+    starts = xy[indices[:, :-1]]
+    ends = xy[indices[:, 1:]]
+    return np.stack([starts, ends], axis=-2).reshape(-1, 2, 2)
+
+
+class RingLayout:
+    """Letters placed on a ring: xy[i] is the position of letters[i]."""
+
+    def __init__(self, letters, radius=1.0, start_angle=0.0):
+        self.letters = list(letters)
+        self.position = {letter: i for i, letter in enumerate(self.letters)}
+        self.xy = ring_layout(len(self.letters), radius, start_angle)
+
+    def __getitem__(self, letter):
+        return self.xy[self.position[letter]]
+
+    def indices(self, groups):
+        """Index array for gates/triplets, see letter_indices."""
+        return letter_indices(self.letters, groups)
+
+    def edge_coords(self, groups):
+        """
+        (m x 2 x 2) segment coordinates along every group: a gate (a, b)
+        gives one edge, a triplet (a, b, c) the edges a->b and b->c.
+        """
+        return path_segments(self.xy, self.indices(groups))
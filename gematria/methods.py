@@ -0,0 +1,133 @@
+"""
+Several gematria methods over a corpus in one pass.
+
+Every letter-wise method is one row of METHOD_LOOKUP, a (methods x codepoint)
+matrix built once at import. A corpus is encoded once (gematria.batch),
+all rows are gathered with a single fancy-indexing step and summed per
+verse with prefix sums, so adding a method costs one more row, not one more
+walk over the text. Kolel is derived afterwards from the word count.
+
+- hechrachi: absolute value, final forms count like their base letter
+- gadol:     final forms 500 ... 900
+- katan:     reduced value, trailing zeros dropped (ק = 100 -> 1)
+- ordinal:   position in the alphabet, א = 1 ... ת = 22 (finals as base)
+- milui:     value of the spelled-out name (HEBREW_LETTER_NAMES), summed
+             with the gadol table like letter_name_gematria in the scripts
+- atbash:    value of the atbash partner (א <-> ת, ב <-> ש, ...)
+- kolel:     hechrachi plus one per word (split at whitespace and maqaf,
+             words without a valued letter not counted)
+
+Usage:
+    python -m gematria.methods sefer_yetzirah.json [more corpora ...]
+"""
+
+import argparse
+from typing import NamedTuple
+
+import numpy as np
+
+from .batch import encode_corpus, word_numbers
+from .corpus import iter_verses
+from .tables import (FINAL_TO_STANDARD, GADOL_VALUES, HEBREW_LETTER_NAMES,
+                     HECHRACHI_VALUES, LETTERS_22, STANDARD_VALUES)
+
+LETTER_METHODS = ("hechrachi", "gadol", "katan", "ordinal", "milui", "atbash")
+METHODS = LETTER_METHODS + ("kolel",)
+
+
+def _katan(value):
+    while value and value % 10 == 0:
+        value //= 10
+    return value
+
+
+def _method_values(letter):
+    """The value of one letter (or final form) under every letter-wise method."""
+    base = FINAL_TO_STANDARD.get(letter, letter)
+    position = LETTERS_22.index(base)
+    name = HEBREW_LETTER_NAMES[base]
+    return (
+        HECHRACHI_VALUES[letter],
+        GADOL_VALUES[letter],
+        _katan(STANDARD_VALUES[base]),
+        position + 1,
+        sum(GADOL_VALUES[l] for l in name),
+        STANDARD_VALUES[LETTERS_22[-1 - position]],
+    )
+
+
+def _build_method_lookup():
+    letters = list(GADOL_VALUES)
+    lookup = np.zeros((len(LETTER_METHODS), max(map(ord, letters)) + 1), dtype=np.int64)
+    for letter in letters:
+        lookup[:, ord(letter)] = _method_values(letter)
+    lookup.setflags(write=False)
+    return lookup
+
+
+METHOD_LOOKUP = _build_method_lookup()
+
+
+class MethodScores(NamedTuple):
+    methods: tuple
+    values: np.ndarray   # (verses x methods), column j is methods[j]
+    letters: np.ndarray  # letters with a value, per verse
+    words: np.ndarray    # words, per verse
+
+    def column(self, method):
+        return self.values[:, self.methods.index(method)]
+
+
+def _segment_sums(values, offsets):
+    """Sums along the last axis per segment, via prefix sums (empty -> 0)."""
+    prefix = np.zeros(values.shape[:-1] + (values.shape[-1] + 1,), dtype=np.int64)
+    np.cumsum(values, axis=-1, out=prefix[..., 1:])
+    return prefix[..., offsets[1:]] - prefix[..., offsets[:-1]]
+
+
+def score_methods(verses, methods=METHODS) -> MethodScores:
+    """Scores every verse under every method in `methods` in one pass."""
+    unknown = set(methods) - set(METHODS)
+    if unknown:
+        raise ValueError(f"unknown methods {sorted(unknown)}; choose from {', '.join(METHODS)}")
+    codepoints, offsets = encode_corpus(verses)
+    inside = codepoints < METHOD_LOOKUP.shape[1]
+    letter_values = METHOD_LOOKUP[:, np.where(inside, codepoints, 0)] * inside
+
+    # Words are split at whitespace and maqaf (niqqud and gershayim stay
+    # inside); a word counts at its first letter with a value
+    is_letter = letter_values[0] != 0
+    letter_at = np.flatnonzero(is_letter)
+    word_of = word_numbers(codepoints, offsets)[letter_at]
+    first = np.ones(len(letter_at), dtype=bool)
+    first[1:] = word_of[1:] != word_of[:-1]
+    word_start = np.zeros(len(is_letter), dtype=bool)
+    word_start[letter_at[first]] = True
+
+    sums = _segment_sums(letter_values, offsets)
+    letters = _segment_sums(is_letter, offsets)
+    words = _segment_sums(word_start, offsets)
+    columns = {name: sums[i] for i, name in enumerate(LETTER_METHODS)}
+    columns["kolel"] = columns["hechrachi"] + words
+    values = np.array([columns[m] for m in methods], dtype=np.int64).reshape(len(methods), len(words)).T
+    return MethodScores(tuple(methods), values, letters, words)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("corpora", nargs="+")
+    parser.add_argument("--methods", nargs="+", choices=METHODS, default=list(METHODS))
+    parser.add_argument("--normalize", action="store_true",
+                        help="strip niqqud, te'amim, tashkeel and Greek accents first")
+    args = parser.parse_args(argv)
+
+    print("\t".join(["chapter", "verse"] + args.methods))
+    for path in args.corpora:
+        records = list(iter_verses(path, args.normalize))
+        scores = score_methods([text for _, _, text in records], args.methods)
+        for (chapter, verse, _), row in zip(records, scores.values.tolist()):
+            print("\t".join(map(str, [chapter, verse] + row)))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,104 @@
+"""
+Corpus-level normalization: niqqud, te'amim, Arabic tashkeel and Greek
+polytonic accents stripped, maqaf turned into a word break, sof pasuq and
+paseq dropped.
+
+strip_diacritics runs unicodedata.normalize and a category test for every
+character. Here every codepoint of the Hebrew, Arabic and Greek blocks is
+folded once, at import, into FOLD_MAP (for str.translate, one C-level pass
+over a whole verse) and FOLD_TABLE (for uint32 codepoint buffers from
+gematria.batch.encode_corpus, one fancy-indexing step over a whole corpus).
+Latin is left alone; the engine folds it the way gematria-sum.py does.
+"""
+
+import unicodedata
+
+import numpy as np
+
+# Blocks that are folded
+NORMALIZE_RANGES = (
+    (0x0300, 0x0370),  # Combining diacritical marks
+    (0x0370, 0x0400),  # Greek and Coptic
+    (0x0590, 0x0600),  # Hebrew
+    (0x0600, 0x0700),  # Arabic
+    (0x0750, 0x0780),  # Arabic supplement
+    (0x1F00, 0x2000),  # Greek extended
+    (0xFB1D, 0xFB50),  # Hebrew presentation forms
+)
+
+MAQAF = "\u05be"
+
+# Punctuation with an explicit replacement
+SPECIAL = {
+    MAQAF: " ",       # joins words; counts as a word break
+    "\u05c0": "",     # paseq
+    "\u05c3": "",     # sof pasuq
+    "\u05c6": "",     # nun hafukha
+    "\u0640": "",     # tatweel (kashida)
+}
+
+# Marker for "delete this codepoint" in FOLD_TABLE
+DELETED = np.uint32(0xFFFFFFFF)
+
+
+def fold_char(char):
+    """The normalized form of one character (possibly "" or several characters)."""
+    if char in SPECIAL:
+        return SPECIAL[char]
+    codepoint = ord(char)
+    # Spacing Greek accents (tonos, psili, ...) carry no letter
+    if unicodedata.category(char) == "Sk" and (0x0370 <= codepoint < 0x0400
+                                               or 0x1F00 <= codepoint < 0x2000):
+        return ""
+    # Presentation forms (wide letters, ligatures) only decompose under NFKD
+    form = "NFKD" if 0xFB1D <= codepoint < 0xFB50 else "NFD"
+    return "".join(c for c in unicodedata.normalize(form, char)
+                   if unicodedata.category(c) != "Mn")
+
+
+def _build_maps():
+    fold_map = {}
+    for start, end in NORMALIZE_RANGES:
+        for codepoint in range(start, end):
+            folded = fold_char(chr(codepoint))
+            if folded != chr(codepoint):
+                fold_map[codepoint] = folded or None
+
+    width = max(len(f) for f in fold_map.values() if f)
+    table = np.full((NORMALIZE_RANGES[-1][1], width), DELETED, dtype=np.uint32)
+    table[:, 0] = np.arange(len(table))
+    for codepoint, folded in fold_map.items():
+        table[codepoint] = DELETED
+        for i, char in enumerate(folded or ""):
+            table[codepoint, i] = ord(char)
+    table.setflags(write=False)
+    return fold_map, table
+
+
+FOLD_MAP, FOLD_TABLE = _build_maps()
+
+
+def normalize(text):
+    """Normalizes a string in one str.translate pass."""
+    return text.translate(FOLD_MAP)
+
+
+def normalize_encoded(codepoints, offsets):
+    """
+    Normalizes an encoded corpus (codepoints, offsets) as returned by
+    encode_corpus; returns the new (codepoints, offsets).
+    """
+    inside = codepoints < len(FOLD_TABLE)
+    mapped = FOLD_TABLE[np.where(inside, codepoints, 0)].copy()
+    mapped[~inside, 0] = codepoints[~inside]
+    keep = mapped != DELETED
+    # New length of every verse: the kept slots of its characters
+    per_char = np.zeros(len(codepoints) + 1, dtype=np.int64)
+    np.cumsum(keep.sum(axis=1), out=per_char[1:])
+    return mapped[keep], per_char[np.asarray(offsets)]
+
+
+def normalized(records):
+    """Normalizes a stream of (chapter, verse, text) records."""
+    for chapter, verse, text in records:
+        yield chapter, verse, text.translate(FOLD_MAP)
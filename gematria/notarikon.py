@@ -0,0 +1,122 @@
+"""
+Notarikon / acrostics: the first, last or k-th letters of every word,
+verse or triplet of a corpus.
+
+ratios-yetzirah.py built its `secret` with `secret += t[0:2]` per verse.
+Here the corpus is encoded once (gematria.batch), reduced to the letters
+that have a value in the chosen system (punctuation, spaces and marks
+dropped, as in gematria.els.letter_stream), the unit boundaries are found
+as offset arrays (words: runs between whitespace or maqaf; triplets:
+consecutive groups of three letters of the verse) and the requested
+positions are gathered with a single fancy-indexing step. The result is an
+ordinary string plus per-verse offsets, so it can go straight into
+score_corpus, gematria.els.letter_stream or gematria.index.
+
+Usage:
+    python -m gematria.notarikon sefer_yetzirah.json [--unit words|verses|triplets]
+        [--positions 0 -1] [--system hechrachi]
+"""
+
+import argparse
+from typing import NamedTuple
+
+import numpy as np
+
+from .batch import SEPARATORS, encode_corpus, map_values, segment_reduce, word_numbers
+from .corpus import iter_verses
+from .els import fold_finals
+from .systems import SYSTEMS, lookup
+
+UNITS = ("words", "verses", "triplets")
+
+
+class Extraction(NamedTuple):
+    text: str             # all extracted letters, in corpus order
+    offsets: np.ndarray   # verse i's letters are text[offsets[i]:offsets[i + 1]]
+
+
+def _counts_to_offsets(counts):
+    offsets = np.zeros(len(counts) + 1, dtype=np.int64)
+    np.cumsum(counts, out=offsets[1:])
+    return offsets
+
+
+def unit_bounds(codepoints, offsets, unit, known):
+    """
+    (stream, starts, ends, unit_verse): the stream of letters with a value
+    (`known` marks them in `codepoints`; separators never count for words
+    and triplets), the [start, end) range of every unit in it and the verse
+    of every unit. Word boundaries come from the separators of the raw text.
+    """
+    if unit not in UNITS:
+        raise ValueError(f"unknown unit {unit!r}; choose from {', '.join(UNITS)}")
+    inside = ~np.isin(codepoints, SEPARATORS)
+    if unit != "verses":
+        known = known & inside
+    stream = codepoints[known]
+    verse_offsets = _counts_to_offsets(segment_reduce(np.add, known.astype(np.int64), offsets, 0))
+    verse_of = np.repeat(np.arange(len(offsets) - 1), np.diff(verse_offsets))
+    if unit == "verses":
+        return stream, verse_offsets[:-1], verse_offsets[1:], np.arange(len(offsets) - 1)
+
+    position = np.arange(len(stream))
+    if unit == "words":
+        # Letters of the same raw word share its number
+        word_of = word_numbers(codepoints, offsets)[known]
+        first = np.ones(len(stream), dtype=bool)
+        first[1:] = word_of[1:] != word_of[:-1]
+        starts = position[first]
+    else:
+        starts = position[(position - verse_offsets[verse_of]) % 3 == 0]
+    unit_verse = verse_of[starts]
+    ends = np.minimum(np.append(starts[1:], len(stream)), verse_offsets[unit_verse + 1])
+    return stream, starts, ends, unit_verse
+
+
+def notarikon(verses, unit="words", positions=(0,), system="hechrachi") -> Extraction:
+    """
+    The letters at `positions` of every unit (0 = first, -1 = last, k = the
+    k-th), in unit order; positions outside a unit are skipped. Only letters
+    with a value in `system` (finals by their base letter) count; with system=None every character of the
+    raw text does, so notarikon(verses, "verses", (0, 1), None) is the old
+    `secret += t[0:2]`.
+    """
+    codepoints, offsets = encode_corpus(verses)
+    if system is None:
+        known = np.ones(len(codepoints), dtype=bool)
+    else:
+        # Finals count as letters even where the system gives them no value
+        known = map_values(fold_finals(codepoints), lookup(system)) != 0
+    stream, starts, ends, unit_verse = unit_bounds(codepoints, offsets, unit, known)
+    positions = np.asarray(positions, dtype=np.int64)
+
+    # (units x positions) indices into the stream
+    index = np.where(positions[None, :] >= 0, starts[:, None] + positions[None, :],
+                     ends[:, None] + positions[None, :])
+    valid = (index >= starts[:, None]) & (index < ends[:, None])
+    letters = stream[index[valid]]
+    counts = np.bincount(np.broadcast_to(unit_verse[:, None], valid.shape)[valid],
+                         minlength=len(offsets) - 1)
+    return Extraction(letters.tobytes().decode("utf-32-le"), _counts_to_offsets(counts))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("corpora", nargs="+")
+    parser.add_argument("--unit", choices=UNITS, default="words")
+    parser.add_argument("--positions", nargs="+", type=int, default=[0])
+    parser.add_argument("--system", choices=list(SYSTEMS), default="hechrachi")
+    parser.add_argument("--normalize", action="store_true",
+                        help="strip niqqud, te'amim, tashkeel and Greek accents first")
+    args = parser.parse_args(argv)
+
+    for path in args.corpora:
+        texts = [text for _, _, text in iter_verses(path, args.normalize)]
+        extraction = notarikon(texts, args.unit, args.positions, args.system)
+        codepoints, _ = encode_corpus([extraction.text])
+        print(extraction.text)
+        print(f"Gematria: {int(map_values(codepoints, lookup(args.system)).sum())}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,118 @@
+"""
+Sum and product of gematria value lists with selectable product modes.
+
+np.prod(..., dtype=np.float64) overflows to inf for long verses, which made
+the inverse of the product a silent 0.0. The modes here keep the result
+meaningful:
+
+- "float": the old float64 product (overflows to inf)
+- "exact": exact int via a balanced product tree
+- "log":   sum of log10 values, reported as mantissa and exponent
+- "mod":   product modulo a prime (2**61 - 1 by default)
+"""
+
+import math
+from fractions import Fraction
+from typing import NamedTuple
+
+import numpy as np
+
+PRODUCT_MODES = ("float", "exact", "log", "mod")
+
+# Mersenne prime, larger than any gematria value, so every product of
+# non-zero values has a modular inverse.
+DEFAULT_MODULUS = 2**61 - 1
+
+
+class LogProduct(NamedTuple):
+    log10: float
+    mantissa: float
+    exponent: int
+
+    @classmethod
+    def from_log10(cls, log10):
+        if math.isinf(log10):
+            return cls(log10, 0.0 if log10 < 0 else math.inf, 0)
+        exponent = math.floor(log10)
+        return cls(log10, 10 ** (log10 - exponent), exponent)
+
+    def inverse(self):
+        """Raises ValueError for a zero product."""
+        if self.log10 == -math.inf:
+            raise ValueError("zero product has no inverse")
+        return LogProduct.from_log10(-self.log10)
+
+    def __str__(self):
+        return f"{self.mantissa!r}e{self.exponent:+d}"
+
+
+class ModProduct(NamedTuple):
+    residue: int
+    modulus: int
+
+    def inverse(self):
+        """Raises ValueError if the residue is not invertible."""
+        return ModProduct(pow(self.residue, -1, self.modulus), self.modulus)
+
+    def __str__(self):
+        return f"{self.residue} (mod {self.modulus})"
+
+
+def product_tree(values) -> int:
+    """
+    Exact product of `values`, multiplying neighbours pairwise level by
+    level so the big ints on both sides of each multiplication stay balanced.
+    """
+    level = [int(v) for v in values]
+    if not level:
+        return 1
+    while len(level) > 1:
+        paired = [level[i] * level[i + 1] for i in range(0, len(level) - 1, 2)]
+        if len(level) % 2:
+            paired.append(level[-1])
+        level = paired
+    return level[0]
+
+
+def log_product(values) -> LogProduct:
+    arr = np.asarray(values, dtype=np.float64)
+    if (arr == 0).any():
+        return LogProduct.from_log10(-math.inf)
+    return LogProduct.from_log10(math.fsum(np.log10(arr)))
+
+
+def mod_product(values, modulus=DEFAULT_MODULUS) -> ModProduct:
+    residue = 1
+    for v in values:
+        residue = residue * int(v) % modulus
+    return ModProduct(residue, modulus)
+
+
+def calculate_sum_and_product(gematria, mode="float", modulus=DEFAULT_MODULUS):
+    sum_ = sum(gematria)
+    if mode == "float":
+        # Use np.prod with dtype=np.float64 to handle large numbers
+        product = np.prod(np.array(gematria, dtype=np.float64))
+    elif mode == "exact":
+        product = product_tree(gematria)
+    elif mode == "log":
+        product = log_product(gematria)
+    elif mode == "mod":
+        product = mod_product(gematria, modulus)
+    else:
+        raise ValueError(f"Unknown product mode {mode!r}, expected one of {PRODUCT_MODES}")
+    return sum_, product
+
+
+def calculate_inverses(sum_, product):
+    inverse_sum = 1 / sum_ if sum_ != 0 else 'infinity'
+    if isinstance(product, (LogProduct, ModProduct)):
+        try:
+            inverse_product = product.inverse()
+        except ValueError:
+            inverse_product = 'infinity'
+    elif isinstance(product, int):
+        inverse_product = Fraction(1, product) if product != 0 else 'infinity'
+    else:
+        inverse_product = 1 / product if product != 0 else 'infinity'
+    return inverse_sum, inverse_product
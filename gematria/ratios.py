@@ -0,0 +1,45 @@
+"""
+Batched adjacent-letter ratios, differences and log-ratios.
+
+Works on the flat value array and offsets produced by gematria.batch: all
+neighbouring pairs are computed at once and the pairs that straddle a verse
+boundary are masked out. The result is ragged again, verse i's ratios are
+ratios[offsets[i]:offsets[i + 1]] (one fewer than its letters).
+"""
+
+from typing import NamedTuple
+
+import numpy as np
+
+
+class AdjacentRatios(NamedTuple):
+    ratios: np.ndarray       # x[i] / x[i-1]
+    differences: np.ndarray  # x[i] - x[i-1]
+    log_ratios: np.ndarray   # log10(x[i] / x[i-1])
+    offsets: np.ndarray
+
+
+def adjacent_ratios(values, offsets) -> AdjacentRatios:
+    values = np.asarray(values)
+    offsets = np.asarray(offsets, dtype=np.int64)
+
+    # Pair j is (values[j], values[j + 1]); it is valid unless j + 1 starts a verse
+    valid = np.ones(max(len(values) - 1, 0), dtype=bool)
+    starts = offsets[1:-1]
+    valid[starts[(starts > 0) & (starts < len(values))] - 1] = False
+
+    prev, curr = values[:-1][valid], values[1:][valid]
+    with np.errstate(divide="ignore", invalid="ignore"):
+        ratios = curr / prev
+        log_ratios = np.log10(curr) - np.log10(prev)
+
+    counts = np.maximum(np.diff(offsets) - 1, 0)
+    ratio_offsets = np.zeros(len(offsets), dtype=np.int64)
+    np.cumsum(counts, out=ratio_offsets[1:])
+    return AdjacentRatios(ratios, curr - prev, log_ratios, ratio_offsets)
+
+
+def ratio_histogram(log_ratios, bins=64):
+    """Histogram of log10 ratios over the whole corpus: (counts, bin_edges)."""
+    finite = log_ratios[np.isfinite(log_ratios)]
+    return np.histogram(finite, bins=bins)
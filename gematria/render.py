@@ -0,0 +1,185 @@
+"""
+Vectorized drawing of the Sefer Yetzirah diagrams.
+
+The visualization scripts used one ax.plot call per gate, per triplet
+segment and per letter. Here all gate edges and all triplet edges are
+single LineCollections and all nodes of a ring are a single scatter, so a
+diagram costs a handful of artists regardless of how many gates it shows.
+Passing an output path renders headless (Agg) and writes PNG/SVG/... instead
+of blocking in plt.show().
+
+DiagramRenderer keeps one figure with its static layers (gates, six
+directions, sefirot ring, letter ring) and only swaps the data layer
+between images, for batch export (see gematria.export).
+"""
+
+import matplotlib.pyplot as plt
+import numpy as np
+from matplotlib.collections import LineCollection
+
+from .layout import letter_indices, path_segments, ring_layout
+from .tables import DOUBLES, LETTERS_22, MOTHERS, SEFIROT_HEBREW
+
+# Colors of the letter categories in the diagrams
+MOTHER_COLOR = 'red'
+DOUBLE_COLOR = 'green'
+SIMPLE_COLOR = 'blue'
+
+# The six directions as drawn from the center (stylized, as in the scripts)
+DIRECTIONS = {
+    'Up': (0, 1),
+    'Down': (0, -1),
+    'East': (1, 0),
+    'West': (-1, 0),
+    'North': (0.7, 0.7),
+    'South': (-0.7, -0.7)
+}
+
+
+def new_figure(output=None, figsize=(10, 10)):
+    """plt.subplots, switching to the non-interactive backend when saving."""
+    if output is not None:
+        plt.switch_backend("Agg")
+    return plt.subplots(figsize=figsize)
+
+
+def finish(fig, output=None):
+    """Writes the figure to `output` (format from the suffix) or shows it."""
+    if output is None:
+        plt.show()
+    else:
+        fig.savefig(output)
+
+
+def category_colors(letters, mothers, doubles):
+    return [MOTHER_COLOR if l in mothers else DOUBLE_COLOR if l in doubles else SIMPLE_COLOR
+            for l in letters]
+
+
+def draw_nodes(ax, xy, labels, colors, markersize=12, fontsize=14):
+    """All nodes of a ring as one scatter, plus their text labels."""
+    xy = np.asarray(xy, dtype=float)
+    ax.scatter(xy[:, 0], xy[:, 1], s=markersize ** 2, c=colors, zorder=5)
+    for (x, y), label in zip(xy, labels):
+        ax.text(x, y, label, ha='center', va='center', fontsize=fontsize, color='white', zorder=6)
+
+
+def draw_edges(ax, segments, **style):
+    """All edges as a single LineCollection."""
+    collection = LineCollection(segments, **style)
+    ax.add_collection(collection)
+    return collection
+
+
+def draw_directions(ax, length=5.5, fontsize=10):
+    ends = np.array(list(DIRECTIONS.values()), dtype=float) * length
+    segments = np.stack([np.zeros_like(ends), ends], axis=1)
+    draw_edges(ax, segments, colors='black', linewidths=1.5, zorder=2)
+    for name, (x, y) in zip(DIRECTIONS, ends):
+        ax.text(x, y, name, fontsize=fontsize, ha='center', va='center', color='black')
+
+
+def draw_triplets(ax, letters, letter_xy, triplets, cmap='rainbow', linewidth=2):
+    """
+    Each triplet as the path letter1 -> letter2 -> letter3, colored along
+    the colormap by its position in `triplets`. Triplets that are not 3
+    letters long or use letters outside `letters` are skipped.
+    """
+    cmap = plt.get_cmap(cmap)
+    keep = [i for i, t in enumerate(triplets)
+            if len(t) == 3 and all(l in letters for l in t)]
+    indices = letter_indices(letters, [triplets[i] for i in keep])
+    colors = cmap(np.repeat(np.array(keep, dtype=float) / max(len(triplets) - 1, 1), 2))
+    return draw_edges(ax, path_segments(letter_xy, indices), colors=colors,
+                      linewidths=linewidth, zorder=3)
+
+
+def ragged_path_segments(xy, paths, position):
+    """
+    Segments along paths of any length. Returns (segments, path_ids,
+    step_fraction): the path each segment belongs to and how far along its
+    path it lies (0..1), for coloring.
+    """
+    paths = [[position[l] for l in path] for path in paths]
+    lengths = np.array([len(p) for p in paths], dtype=np.intp)
+    if not len(paths) or lengths.sum() < 2:
+        return np.zeros((0, 2, 2)), np.zeros(0, dtype=np.intp), np.zeros(0)
+    flat = np.concatenate([np.asarray(p, dtype=np.intp) for p in paths])
+    path_of = np.repeat(np.arange(len(paths)), lengths)
+
+    # Pair j is (flat[j], flat[j + 1]); keep it only inside one path
+    valid = path_of[:-1] == path_of[1:]
+    starts = np.flatnonzero(valid)
+    xy = np.asarray(xy, dtype=float)
+    segments = np.stack([xy[flat[starts]], xy[flat[starts + 1]]], axis=1)
+
+    first = np.concatenate([[0], np.cumsum(lengths)[:-1]])
+    steps = starts - first[path_of[starts]]
+    fraction = steps / np.maximum(lengths[path_of[starts]] - 2, 1)
+    return segments, path_of[starts], fraction
+
+
+class DiagramRenderer:
+    """
+    One reusable, headless figure for batch export.
+
+    The static layers are drawn once. Each call to draw() replaces the data
+    layer (a single LineCollection of paths), optionally relabels the letter
+    ring for a different ordering, and saves the figure.
+    """
+
+    def __init__(self, letters=LETTERS_22, mothers=MOTHERS, doubles=DOUBLES,
+                 sefirot=SEFIROT_HEBREW, gates=True, figsize=(10, 10)):
+        self.mothers, self.doubles = mothers, doubles
+        plt.switch_backend("Agg")
+        self.fig, self.ax = plt.subplots(figsize=figsize)
+        ax = self.ax
+        ax.set_aspect('equal')
+        ax.axis('off')
+        ax.set_xlim(-9, 9)
+        ax.set_ylim(-9, 9)
+
+        self.letter_xy = ring_layout(len(letters), 8.0, 90.0)
+        if gates:
+            # The complete graph looks the same for every ordering of the ring
+            gate_index = np.array(np.triu_indices(len(letters), k=1)).T
+            draw_edges(ax, path_segments(self.letter_xy, gate_index),
+                       colors='gray', linewidths=0.5, alpha=0.3, zorder=1)
+        draw_directions(ax, length=5.5)
+        draw_nodes(ax, ring_layout(len(sefirot), 3.0, 90.0), sefirot, 'purple', markersize=8, fontsize=10)
+
+        self.nodes = ax.scatter(self.letter_xy[:, 0], self.letter_xy[:, 1], s=144, zorder=5)
+        self.labels = [ax.text(x, y, '', ha='center', va='center', fontsize=14,
+                               color='white', zorder=6) for x, y in self.letter_xy]
+        self.data = draw_edges(ax, np.zeros((0, 2, 2)), linewidths=2, zorder=3)
+        self.title = ax.set_title('')
+        self.set_ordering(letters)
+
+    def set_ordering(self, letters):
+        """Puts `letters` around the ring (same number of letters as before)."""
+        letters = list(letters)
+        if len(letters) != len(self.letter_xy):
+            raise ValueError(f"ordering has {len(letters)} letters, the ring has {len(self.letter_xy)}")
+        self.letters = letters
+        self.position = {letter: i for i, letter in enumerate(self.letters)}
+        self.nodes.set_facecolors(category_colors(self.letters, self.mothers, self.doubles))
+        for text, letter in zip(self.labels, self.letters):
+            text.set_text(letter)
+
+    def draw(self, paths, output, title='', cmap='rainbow', color_by='path'):
+        """
+        Draws `paths` (letter sequences) and saves to `output`. Paths with
+        letters outside the ring are skipped. color_by='path' gives each path
+        one color, color_by='step' shades every path from start to end.
+        """
+        paths = [p for p in paths if all(l in self.position for l in p)]
+        segments, path_ids, fraction = ragged_path_segments(self.letter_xy, paths, self.position)
+        if color_by == 'path':
+            fraction = path_ids / max(len(paths) - 1, 1)
+        self.data.set_segments(segments)
+        self.data.set_color(plt.get_cmap(cmap)(fraction))
+        self.title.set_text(title)
+        self.fig.savefig(output)
+
+    def close(self):
+        plt.close(self.fig)
@@ -0,0 +1,55 @@
+"""
+Value -> letters inverted index for turning gematria values back into text.
+
+The old gematria_to_text scanned the whole table for every value and emitted
+every letter sharing that value. ReverseIndex is built once and picks exactly
+one letter per value, so decoding is a dict lookup per value.
+"""
+
+from .scripts import is_final_form, letter_script
+
+
+class ReverseIndex:
+    """
+    Maps gematria values back to letters.
+
+    `scripts` restricts the candidates (e.g. {"HEBREW"}); candidates keep the
+    order of the table, so the first one wins. A 0 in the decoded sequence
+    marks a word break; with `prefer_final` the last letter of each word uses
+    a final form (ך, ם, ן, ף, ץ, ς) when the value has one.
+    """
+
+    def __init__(self, values, scripts=None, prefer_final=True):
+        self.prefer_final = prefer_final
+        self.letters = {}
+        for letter, value in values.items():
+            if len(letter) != 1 or value == 0:
+                continue
+            if scripts is not None and letter_script(letter) not in scripts:
+                continue
+            self.letters.setdefault(value, []).append(letter)
+
+        self._medial = {}
+        self._final = {}
+        for value, letters in self.letters.items():
+            medial = [l for l in letters if not is_final_form(l)]
+            final = [l for l in letters if is_final_form(l)]
+            self._medial[value] = (medial or final)[0]
+            self._final[value] = (final or medial)[0]
+
+    def letters_for(self, value) -> list:
+        """All candidate letters for `value`, in table order."""
+        return self.letters.get(value, [])
+
+    def decode(self, gematria, missing="") -> str:
+        """Turns a value sequence into text; unknown values become `missing`."""
+        gematria = list(gematria)
+        out = []
+        for i, value in enumerate(gematria):
+            if value == 0:
+                out.append(" ")
+                continue
+            word_end = i + 1 == len(gematria) or gematria[i + 1] == 0
+            table = self._final if self.prefer_final and word_end else self._medial
+            out.append(table.get(value, missing))
+        return "".join(out)
@@ -0,0 +1,145 @@
+"""
+Script (writing system) classification and per-script scoring.
+
+The multi-script tables mix Latin, Arabic abjad, Greek isopsephy and Hebrew,
+so calculate_gematria sums a mixed string across all of them. Here every
+codepoint of the Basic Multilingual Plane is classified once, at import,
+from SCRIPT_RANGES into SCRIPT_TABLE (codepoint -> index into SCRIPT_NAMES).
+score_by_script encodes a corpus once (gematria.batch), gathers values and
+scripts with one fancy-indexing step each and accumulates (verse, script)
+sums and letter counts with a single bincount.
+
+Usage:
+    python -m gematria.scripts sefer_yetzirah.json [more corpora ...] [--system multi]
+"""
+
+import argparse
+import unicodedata
+from functools import lru_cache
+from typing import NamedTuple
+
+import numpy as np
+
+from .batch import encode_corpus, map_values
+from .corpus import iter_verses
+from .engine import GematriaEngine
+from .systems import SYSTEMS, system
+
+SCRIPTS = ("LATIN", "ARABIC", "GREEK", "HEBREW")
+# Column names of ScriptScores: the scripts plus everything else
+SCRIPT_NAMES = SCRIPTS + ("OTHER",)
+OTHER = len(SCRIPTS)
+
+# [start, end) codepoint ranges of every script
+SCRIPT_RANGES = (
+    (0x0041, 0x005B, "LATIN"),    # A-Z
+    (0x0061, 0x007B, "LATIN"),    # a-z
+    (0x00C0, 0x00D7, "LATIN"),    # Latin-1 letters (without × and ÷)
+    (0x00D8, 0x00F7, "LATIN"),
+    (0x00F8, 0x0250, "LATIN"),    # .. Latin Extended-B
+    (0x1E00, 0x1F00, "LATIN"),    # Latin Extended Additional
+    (0x0370, 0x0400, "GREEK"),    # Greek and Coptic
+    (0x1F00, 0x2000, "GREEK"),    # Greek Extended
+    (0x0590, 0x0600, "HEBREW"),
+    (0xFB1D, 0xFB50, "HEBREW"),   # Hebrew presentation forms
+    (0x0600, 0x0700, "ARABIC"),
+    (0x0750, 0x0780, "ARABIC"),   # Arabic supplement
+    (0xFB50, 0xFE00, "ARABIC"),   # Arabic presentation forms A
+    (0xFE70, 0xFF00, "ARABIC"),   # Arabic presentation forms B
+)
+
+
+def _build_script_table():
+    table = np.full(0x10000, OTHER, dtype=np.uint8)
+    for start, end, script in SCRIPT_RANGES:
+        table[start:end] = SCRIPTS.index(script)
+    table.setflags(write=False)
+    return table
+
+
+SCRIPT_TABLE = _build_script_table()
+
+
+def letter_script(char: str) -> str:
+    """Returns 'HEBREW', 'GREEK', ... for a letter, or '' outside the four scripts."""
+    codepoint = ord(char)
+    index = SCRIPT_TABLE[codepoint] if codepoint < len(SCRIPT_TABLE) else OTHER
+    return SCRIPTS[index] if index != OTHER else ""
+
+
+def is_final_form(char: str) -> bool:
+    """True for word-final letter forms such as ך or ς."""
+    return "FINAL" in unicodedata.name(char, "")
+
+
+def script_indices(codepoints) -> np.ndarray:
+    """Index into SCRIPT_NAMES for every codepoint of a uint32 array."""
+    inside = codepoints < len(SCRIPT_TABLE)
+    return np.where(inside, SCRIPT_TABLE[np.where(inside, codepoints, 0)], OTHER)
+
+
+@lru_cache(maxsize=None)
+def folded_lookup(name) -> np.ndarray:
+    """
+    Read-only codepoint -> value array of system `name` with the engine's
+    folding (accented and pointed letters count like their base letter), so
+    its sums match GematriaEngine.score.
+    """
+    engine = GematriaEngine(system(name))
+    chars = {chr(c) for start, end, _ in SCRIPT_RANGES for c in range(start, end)}
+    chars.update(k for k in engine.values if len(k) == 1)
+    lookup = np.zeros(max(map(ord, chars)) + 1, dtype=np.int64)
+    for char in chars:
+        lookup[ord(char)] = engine.letter_value(char)
+    lookup.setflags(write=False)
+    return lookup
+
+
+class ScriptScores(NamedTuple):
+    sums: np.ndarray     # (verses x SCRIPT_NAMES), value per script
+    counts: np.ndarray   # (verses x SCRIPT_NAMES), letters with a value per script
+
+    def column(self, script):
+        return self.sums[:, SCRIPT_NAMES.index(script)]
+
+    def dominant(self) -> list:
+        """The script with the most letters per verse ('' for none)."""
+        best = self.counts[:, :OTHER].argmax(axis=1)
+        found = self.counts[:, :OTHER].max(axis=1) > 0
+        return [SCRIPTS[b] if f else "" for b, f in zip(best.tolist(), found.tolist())]
+
+
+def score_by_script(verses, system_name="multi") -> ScriptScores:
+    """Per-script sums and letter counts of every verse, in one pass."""
+    codepoints, offsets = encode_corpus(verses)
+    values = map_values(codepoints, folded_lookup(system_name))
+    verse_of = np.repeat(np.arange(len(offsets) - 1), np.diff(offsets))
+    # One bin per (verse, script) pair
+    bins = verse_of * len(SCRIPT_NAMES) + script_indices(codepoints)
+    size = (len(offsets) - 1) * len(SCRIPT_NAMES)
+    shape = (len(offsets) - 1, len(SCRIPT_NAMES))
+    sums = np.bincount(bins, weights=values, minlength=size).astype(np.int64).reshape(shape)
+    counts = np.bincount(bins, weights=values != 0, minlength=size).astype(np.int64).reshape(shape)
+    return ScriptScores(sums, counts)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("corpora", nargs="+")
+    parser.add_argument("--system", choices=list(SYSTEMS), default="multi")
+    parser.add_argument("--normalize", action="store_true",
+                        help="strip niqqud, te'amim, tashkeel and Greek accents first")
+    args = parser.parse_args(argv)
+
+    letters = tuple(f"{name}_letters" for name in SCRIPT_NAMES)
+    print("\t".join(("chapter", "verse", "script") + SCRIPT_NAMES + letters))
+    for path in args.corpora:
+        records = list(iter_verses(path, args.normalize))
+        scores = score_by_script([text for _, _, text in records], args.system)
+        for (chapter, verse, _), script, sums, counts in zip(
+                records, scores.dominant(), scores.sums.tolist(), scores.counts.tolist()):
+            print("\t".join(map(str, [chapter, verse, script or "-", *sums, *counts])))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,120 @@
+"""
+Contiguous runs of letters or words whose gematria equals a target.
+
+Letters (and words) without a value are dropped, so all values are positive
+and the prefix sums over the whole corpus strictly increase. A window
+[i, j) has sum N exactly when prefix[j] == prefix[i] + N, so one
+np.searchsorted of prefix + N over the prefix array finds, for every start
+at once, the only end that can match. That is the hash-of-prefix-sums
+search in sorted form: O(n log n) per target over the whole corpus, with
+memory linear in the corpus (targets are searched one at a time), instead
+of enumerating every window of every verse.
+
+Usage:
+    python -m gematria.search sefer_yetzirah.json 26 72 [--words]
+        [--system hechrachi] [--max-length N]
+"""
+
+import argparse
+from typing import NamedTuple
+
+import numpy as np
+
+from .batch import encode_corpus, map_values, score_words, segment_reduce
+from .corpus import iter_verses
+from .systems import SYSTEMS, lookup
+
+
+class Windows(NamedTuple):
+    target: np.ndarray  # the target the window sums to
+    verse: np.ndarray   # verse index
+    start: np.ndarray   # first unit (letter or word), relative to the verse
+    stop: np.ndarray    # one past the last unit
+
+
+def find_windows(values, offsets, targets, max_length=None) -> Windows:
+    """
+    All windows of the ragged positive `values` (verse i is
+    values[offsets[i]:offsets[i + 1]]) that sum to one of `targets`.
+    Windows never cross a verse boundary. Sorted by target, then position.
+    """
+    values = np.asarray(values, dtype=np.int64)
+    offsets = np.asarray(offsets, dtype=np.int64)
+    targets = np.atleast_1d(np.asarray(targets, dtype=np.int64))
+    prefix = np.zeros(len(values) + 1, dtype=np.int64)
+    np.cumsum(values, out=prefix[1:])
+
+    starts = np.arange(len(values))
+    verse_of = np.repeat(np.arange(len(offsets) - 1), np.diff(offsets))
+    verse_end = offsets[1:][verse_of]
+
+    # One target at a time, so memory stays a few arrays of corpus length
+    found_targets, found_starts, found_stops = [], [], []
+    for target in targets.tolist():
+        wanted = prefix[:-1] + target
+        ends = np.searchsorted(prefix, wanted)
+        found = (ends > starts) & (ends <= verse_end) & (prefix[np.minimum(ends, len(values))] == wanted)
+        if max_length is not None:
+            found &= ends - starts <= max_length
+        start = np.flatnonzero(found)
+        found_targets.append(np.full(len(start), target, dtype=np.int64))
+        found_starts.append(start)
+        found_stops.append(ends[start])
+    empty = np.zeros(0, dtype=np.int64)
+    target = np.concatenate(found_targets) if found_targets else empty
+    start = np.concatenate(found_starts) if found_starts else empty
+    stop = np.concatenate(found_stops) if found_stops else empty
+    verse = verse_of[start]
+    return Windows(target, verse, start - offsets[verse], stop - offsets[verse])
+
+
+def search_letters(verses, targets, system="hechrachi", max_length=None):
+    """
+    Letter windows summing to a target. Returns (Windows, letters) where
+    letters[i] is the string of verse i's letters that have a value.
+    """
+    verses = list(verses)
+    codepoints, offsets = encode_corpus(verses)
+    letter_values = map_values(codepoints, lookup(system))
+    known = letter_values != 0
+    counts = segment_reduce(np.add, known.astype(np.int64), offsets, 0)
+    kept_offsets = np.zeros(len(verses) + 1, dtype=np.int64)
+    np.cumsum(counts, out=kept_offsets[1:])
+    text = codepoints[known].tobytes().decode("utf-32-le")
+    letters = [text[a:b] for a, b in zip(kept_offsets[:-1].tolist(), kept_offsets[1:].tolist())]
+    return find_windows(letter_values[known], kept_offsets, targets, max_length), letters
+
+
+def search_words(verses, targets, system="hechrachi", max_length=None):
+    """
+    Word windows summing to a target. Returns (Windows, words) where
+    words[i] is the list of verse i's words that have a value.
+    """
+    scores = score_words(verses, lookup(system))
+    words = [scores.words[a:b] for a, b in zip(scores.offsets[:-1].tolist(), scores.offsets[1:].tolist())]
+    return find_windows(scores.values, scores.offsets, targets, max_length), words
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("corpus")
+    parser.add_argument("targets", nargs="+", type=int)
+    parser.add_argument("--words", action="store_true", help="windows of words instead of letters")
+    parser.add_argument("--system", choices=list(SYSTEMS), default="hechrachi")
+    parser.add_argument("--max-length", type=int, default=None)
+    parser.add_argument("--normalize", action="store_true",
+                        help="strip niqqud, te'amim, tashkeel and Greek accents first")
+    args = parser.parse_args(argv)
+
+    records = list(iter_verses(args.corpus, args.normalize))
+    search = search_words if args.words else search_letters
+    windows, units = search([text for _, _, text in records], args.targets,
+                            args.system, args.max_length)
+    separator = " " if args.words else ""
+    for target, verse, start, stop in zip(*(column.tolist() for column in windows)):
+        chapter, number, _ = records[verse]
+        print(f"{target}\t{chapter}:{number}\t{start}-{stop}\t{separator.join(units[verse][start:stop])}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,156 @@
+"""
+Long-running gematria query server with warm tables.
+
+gematria-sum.py pays interpreter start-up and table construction for every
+query. Here the engines, the method lookup matrix and (optionally) a corpus
+value index are built once and then answer one query per line, over stdin
+or a local socket, each in well under a millisecond.
+
+Protocol: one command per line, one JSON object per answer line.
+
+    value TEXT      {"value": 26, "unknown": []}
+    methods TEXT    {"hechrachi": 26, "gadol": 26, ...}
+    words N         {"value": N, "occurrences": [[chapter, verse, word, length, text], ...]}
+                    (only while the session's system is the index's system)
+    system NAME     {"system": NAME}   (for the rest of this session)
+    ping            {"pong": true}
+    quit            closes the session
+
+Errors are answered as {"error": "..."}.
+
+Usage:
+    python -m gematria.server [--corpus sefer_yetzirah.json | --index sy.index]
+        [--system multi-hechrachi] [--max-words 3] [--port 7722 | --unix PATH]
+"""
+
+import argparse
+import json
+import socket
+import socketserver
+import sys
+
+from .corpus import iter_verses
+from .engine import GematriaEngine
+from .index import ValueIndex
+from .methods import score_methods
+from .systems import SYSTEMS, system
+
+
+class GematriaService:
+    """Warm state shared by all sessions: engines per system and a value index."""
+
+    def __init__(self, default_system=None, index=None):
+        # By default 'value' uses the index's system, so its answers can be
+        # looked up with 'words'
+        if default_system is None:
+            default_system = index.system if index is not None else "multi-hechrachi"
+        self.default_system = default_system
+        self.index = index
+        self._engines = {}
+        self.engine(default_system)
+        score_methods([""])  # first-call overhead out of the way
+
+    def engine(self, name):
+        if name not in self._engines:
+            self._engines[name] = GematriaEngine(system(name))
+        return self._engines[name]
+
+    def handle(self, line, session):
+        """Answers one protocol line; `session` holds per-client state."""
+        command, _, argument = line.strip().partition(" ")
+        try:
+            if command == "value":
+                engine = self.engine(session.get("system", self.default_system))
+                return {"value": engine.score(argument), "unknown": sorted(engine.unknown(argument))}
+            if command == "methods":
+                scores = score_methods([argument])
+                return dict(zip(scores.methods, scores.values[0].tolist()))
+            if command == "words":
+                if self.index is None:
+                    return {"error": "no corpus loaded (start with --corpus or --index)"}
+                current = session.get("system", self.default_system)
+                if current != self.index.system:
+                    return {"error": f"the index holds {self.index.system} values, "
+                                     f"this session uses {current} (send 'system {self.index.system}')"}
+                value = int(argument)
+                return {"value": value,
+                        "occurrences": [list(o[1:]) for o in self.index.find(value)]}
+            if command == "system":
+                self.engine(argument)
+                session["system"] = argument
+                return {"system": argument}
+            if command == "ping":
+                return {"pong": True}
+            return {"error": f"unknown command {command!r}"}
+        except ValueError as e:
+            return {"error": str(e)}
+
+    def serve_lines(self, lines, write):
+        """Runs one session over an iterable of lines until EOF or `quit`."""
+        session = {}
+        for line in lines:
+            if line.strip() == "quit":
+                break
+            if not line.strip():
+                continue
+            write(json.dumps(self.handle(line, session), ensure_ascii=False) + "\n")
+
+
+def serve_stdio(service):
+    def write(text):
+        sys.stdout.write(text)
+        sys.stdout.flush()
+    service.serve_lines(sys.stdin, write)
+
+
+def make_socket_server(service, port=None, unix_path=None):
+    """A threading TCP server on localhost, or a Unix socket server."""
+
+    class Handler(socketserver.StreamRequestHandler):
+        def handle(self):
+            lines = (raw.decode("utf-8") for raw in self.rfile)
+            service.serve_lines(lines, lambda text: self.wfile.write(text.encode("utf-8")))
+
+    if unix_path is not None:
+        server = socketserver.ThreadingUnixStreamServer(unix_path, Handler)
+    else:
+        server = socketserver.ThreadingTCPServer(("127.0.0.1", port), Handler)
+        server.socket.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+    server.daemon_threads = True
+    return server
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    corpus = parser.add_mutually_exclusive_group()
+    corpus.add_argument("--corpus", help="build a value index for this corpus at start-up")
+    corpus.add_argument("--index", help="open a saved value index (see gematria.index)")
+    parser.add_argument("--system", choices=list(SYSTEMS), default=None,
+                        help="system of 'value' and of the --corpus index (default: the "
+                             "--index's system, else multi-hechrachi)")
+    parser.add_argument("--max-words", type=int, default=3)
+    parser.add_argument("--normalize", action="store_true",
+                        help="strip niqqud, te'amim, tashkeel and Greek accents first")
+    transport = parser.add_mutually_exclusive_group()
+    transport.add_argument("--port", type=int, help="listen on 127.0.0.1:PORT")
+    transport.add_argument("--unix", help="listen on a Unix socket")
+    args = parser.parse_args(argv)
+
+    index = None
+    if args.corpus:
+        records = iter_verses(args.corpus, args.normalize)
+        index = ValueIndex.build(records, args.system or "multi-hechrachi", args.max_words)
+    elif args.index:
+        index = ValueIndex.open(args.index)
+    service = GematriaService(args.system, index)
+
+    if args.port is None and args.unix is None:
+        serve_stdio(service)
+        return
+    with make_socket_server(service, args.port, args.unix) as server:
+        print(f"listening on {args.unix or f'127.0.0.1:{args.port}'}", file=sys.stderr)
+        server.serve_forever()
+
+
+if __name__ == "__main__":
+    main()
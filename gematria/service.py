@@ -0,0 +1,228 @@
+"""
+Local HTTP/JSON gematria service with request batching.
+
+An asyncio front end parses the HTTP requests; a Batcher collects the texts
+of all requests that arrive within a few milliseconds and hands them to a
+process pool as one batch. Each worker keeps warm engines (gematria.engine,
+same values as calculate_gematria in gematria-sum.py) and scores a batch
+with one score_methods call, so a busy front end costs one vectorized call
+per batch instead of one process spawn per word.
+
+Endpoints:
+    POST /score   {"texts": ["...", ...], "system": "multi", "methods": ["gadol", ...]}
+    GET  /score?text=...&text=...&system=multi&methods=gadol,katan
+    GET  /health
+Answer:
+    {"system": "multi", "results": [{"value": 26, "unknown": [], "methods": {"gadol": 26, ...}}]}
+
+Usage:
+    python -m gematria.service [--port 8722] [--workers N] [--batch-delay-ms 2]
+"""
+
+import argparse
+import asyncio
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor
+from urllib.parse import parse_qs, urlsplit
+
+from .engine import GematriaEngine
+from .methods import METHODS, score_methods
+from .systems import SYSTEMS, system
+
+MAX_BODY = 16 * 1024 * 1024
+
+_engines = {}
+
+
+def score_batch(texts, system_name, methods):
+    """Runs in a worker: value, unknown characters and methods for every text."""
+    if system_name not in _engines:
+        _engines[system_name] = GematriaEngine(system(system_name))
+    engine = _engines[system_name]
+    scores = score_methods(texts, methods)
+    return [{"value": engine.score(text), "unknown": sorted(engine.unknown(text)),
+             "methods": dict(zip(methods, row))}
+            for text, row in zip(texts, scores.values.tolist())]
+
+
+class Batcher:
+    """
+    Coalesces concurrent requests: texts arriving within `delay` seconds
+    (or up to `max_texts`) are scored together, one executor call per
+    (system, methods) group.
+    """
+
+    def __init__(self, executor, delay=0.002, max_texts=4096):
+        self.executor = executor
+        self.delay = delay
+        self.max_texts = max_texts
+        self.queue = asyncio.Queue()
+        self.task = None
+
+    async def score(self, texts, system_name, methods):
+        if self.task is None:
+            self.task = asyncio.create_task(self._run())
+        future = asyncio.get_running_loop().create_future()
+        await self.queue.put((list(texts), system_name, tuple(methods), future))
+        return await future
+
+    async def _collect(self):
+        batch = [await self.queue.get()]
+        size = len(batch[0][0])
+        deadline = asyncio.get_running_loop().time() + self.delay
+        while size < self.max_texts:
+            timeout = deadline - asyncio.get_running_loop().time()
+            if timeout <= 0:
+                break
+            try:
+                item = await asyncio.wait_for(self.queue.get(), timeout)
+            except asyncio.TimeoutError:
+                break
+            batch.append(item)
+            size += len(item[0])
+        return batch
+
+    async def _run(self):
+        # Batches are dispatched without waiting for the previous one, so all
+        # workers of the pool can be busy at once
+        pending = set()
+        while True:
+            groups = {}
+            for item in await self._collect():
+                groups.setdefault(item[1:3], []).append(item)
+            for (system_name, methods), items in groups.items():
+                task = asyncio.create_task(self._dispatch(system_name, methods, items))
+                pending.add(task)
+                task.add_done_callback(pending.discard)
+
+    async def _dispatch(self, system_name, methods, items):
+        texts = [text for item in items for text in item[0]]
+        try:
+            results = await asyncio.get_running_loop().run_in_executor(
+                self.executor, score_batch, texts, system_name, methods)
+        except Exception as e:
+            for *_, future in items:
+                future.set_exception(e)
+            return
+        start = 0
+        for item_texts, *_, future in items:
+            future.set_result(results[start:start + len(item_texts)])
+            start += len(item_texts)
+
+
+def _parse_query(target, body):
+    """(texts, system, methods) from a GET query string or a POST JSON body."""
+    if body is not None:
+        request = json.loads(body or b"{}")
+        if not isinstance(request, dict):
+            raise ValueError("expected a JSON object")
+        texts = request.get("texts", [])
+        system_name = request.get("system", "multi")
+        methods = request.get("methods", list(METHODS))
+    else:
+        query = parse_qs(urlsplit(target).query)
+        texts = query.get("text", [])
+        system_name = query.get("system", ["multi"])[0]
+        methods = query["methods"][0].split(",") if "methods" in query else list(METHODS)
+    if not isinstance(texts, list) or not all(isinstance(t, str) for t in texts):
+        raise ValueError("texts must be a list of strings")
+    if not isinstance(methods, list) or not all(isinstance(m, str) for m in methods):
+        raise ValueError("methods must be a list of strings")
+    if not isinstance(system_name, str):
+        raise ValueError("system must be a string")
+    if system_name not in SYSTEMS:
+        raise ValueError(f"unknown gematria system {system_name!r}; choose from {', '.join(SYSTEMS)}")
+    unknown = set(methods) - set(METHODS)
+    if unknown:
+        raise ValueError(f"unknown methods {sorted(unknown)}; choose from {', '.join(METHODS)}")
+    return texts, system_name, methods
+
+
+async def _respond(writer, status, payload, keep_alive):
+    body = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+    reason = {200: "OK", 400: "Bad Request", 404: "Not Found", 413: "Payload Too Large"}[status]
+    writer.write(f"HTTP/1.1 {status} {reason}\r\n"
+                 f"Content-Type: application/json; charset=utf-8\r\n"
+                 f"Content-Length: {len(body)}\r\n"
+                 f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n".encode("ascii") + body)
+    await writer.drain()
+
+
+def make_handler(batcher):
+    async def handle(reader, writer):
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line:
+                    break
+                parts = request_line.decode("latin-1").split()
+                if len(parts) != 3:
+                    await _respond(writer, 400, {"error": "malformed request line"}, False)
+                    break
+                method, target, version = parts
+                headers = {}
+                while (line := await reader.readline()) not in (b"\r\n", b"\n", b""):
+                    name, _, value = line.decode("latin-1").partition(":")
+                    headers[name.strip().lower()] = value.strip()
+                keep_alive = (headers.get("connection", "").lower() != "close"
+                              and version == "HTTP/1.1")
+                length = headers.get("content-length", "0")
+                if not (length.isascii() and length.isdigit()):
+                    # Without a length the body cannot be skipped, so close
+                    await _respond(writer, 400, {"error": "invalid Content-Length"}, False)
+                    break
+                length = int(length)
+                if length > MAX_BODY:
+                    await _respond(writer, 413, {"error": "request too large"}, False)
+                    break
+                body = await reader.readexactly(length) if method == "POST" else None
+
+                path = urlsplit(target).path
+                if path == "/health":
+                    await _respond(writer, 200, {"ok": True}, keep_alive)
+                elif path == "/score" and method in ("GET", "POST"):
+                    try:
+                        texts, system_name, methods = _parse_query(target, body)
+                    except ValueError as e:
+                        await _respond(writer, 400, {"error": str(e)}, keep_alive)
+                    else:
+                        results = await batcher.score(texts, system_name, methods) if texts else []
+                        await _respond(writer, 200, {"system": system_name, "results": results},
+                                       keep_alive)
+                else:
+                    await _respond(writer, 404, {"error": f"no route {method} {path}"}, keep_alive)
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError, ValueError):
+            pass
+        finally:
+            writer.close()
+    return handle
+
+
+async def serve(host="127.0.0.1", port=8722, workers=None, delay=0.002):
+    with ProcessPoolExecutor(max_workers=workers or os.cpu_count() or 1) as executor:
+        batcher = Batcher(executor, delay)
+        await batcher.score([""], "multi", METHODS)  # start and warm a worker
+        server = await asyncio.start_server(make_handler(batcher), host, port)
+        print(f"serving on http://{host}:{port}", flush=True)
+        async with server:
+            await server.serve_forever()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8722)
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--batch-delay-ms", type=float, default=2.0)
+    args = parser.parse_args(argv)
+    try:
+        asyncio.run(serve(args.host, args.port, args.workers, args.batch_delay_ms / 1000))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,56 @@
+"""
+Named gematria systems, loaded once per interpreter.
+
+Every script used to carry its own copy of the table (GEMATRIA_TABLE,
+gematria_values, valores_gematria, ...), and the copies disagreed on the
+final forms. SYSTEMS maps a name to one read-only {letter: value} table and
+LOOKUPS holds the matching codepoint-indexed arrays (see
+gematria.batch.build_lookup), built here at import time and shared by every
+script, CLI and worker process that imports the package.
+
+- standard:        the 22 letters, final forms have no value
+- hechrachi:       22 letters, final forms count like their base letter
+- gadol:           22 letters, final forms 500 ... 900 (mispar gadol)
+- multi:           Latin, Arabic, Hebrew (gadol finals) and Greek
+- multi-hechrachi: the multi-script table with hechrachi finals
+"""
+
+from types import MappingProxyType
+
+from .batch import build_lookup
+from .tables import (GADOL_VALUES, HECHRACHI_VALUES, MULTI_SCRIPT_HECHRACHI_VALUES,
+                     MULTI_SCRIPT_VALUES, STANDARD_VALUES)
+
+SYSTEMS = MappingProxyType({
+    "standard": MappingProxyType(STANDARD_VALUES),
+    "hechrachi": MappingProxyType(HECHRACHI_VALUES),
+    "gadol": MappingProxyType(GADOL_VALUES),
+    "multi": MappingProxyType(MULTI_SCRIPT_VALUES),
+    "multi-hechrachi": MappingProxyType(MULTI_SCRIPT_HECHRACHI_VALUES),
+})
+
+
+def _frozen(array):
+    array.setflags(write=False)
+    return array
+
+
+LOOKUPS = MappingProxyType({name: _frozen(build_lookup(values))
+                            for name, values in SYSTEMS.items()})
+
+
+def _check(name):
+    if name not in SYSTEMS:
+        raise ValueError(f"unknown gematria system {name!r}; choose from {', '.join(SYSTEMS)}")
+
+
+def system(name):
+    """The read-only {letter: value} table of system `name`."""
+    _check(name)
+    return SYSTEMS[name]
+
+
+def lookup(name):
+    """The read-only codepoint -> value array of system `name`."""
+    _check(name)
+    return LOOKUPS[name]
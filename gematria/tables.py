@@ -0,0 +1,114 @@
+"""
+Gematria tables shared by the scripts in this repository.
+
+MULTI_SCRIPT_VALUES is the mixed table from gematria-sum.py: Latin letters,
+Arabic abjad, Hebrew with large final forms and Greek isopsephy including
+the accented variants.
+
+STANDARD_VALUES holds the 22 letters without final forms, GADOL_VALUES adds
+the final forms with their large values (mispar gadol, ך = 500 ... ץ = 900)
+and HECHRACHI_VALUES gives the final forms the value of their base letter
+(ך = 20, as in gem-2-long64-sh-10-final-2.py). MULTI_SCRIPT_HECHRACHI_VALUES
+is the multi-script table with those final values. LETTERS_22,
+MOTHERS, DOUBLES, HEBREW_LETTER_NAMES and SEFIROT_HEBREW are the Sefer
+Yetzirah alphabet data used by the diagrams and gematria.methods.
+"""
+
+MULTI_SCRIPT_VALUES = {
+    # Lateinische Buchstaben
+    'a': 1, 'b': 2, 'c': 3, 'd': 4, 'e': 5, 'f': 6, 'g': 7, 'h': 8, 'i': 9, 'j': 600,
+    'k': 10, 'l': 20, 'm': 30, 'n': 40, 'o': 50, 'p': 60, 'q': 70, 'r': 80, 's': 90,
+    't': 100, 'u': 200, 'v': 700, 'w': 900, 'x': 300, 'y': 400, 'z': 500,
+    # Grundformen arabischer Buchstaben
+    'ا': 1, 'أ': 1, 'إ': 1, 'آ': 1, 'ب': 2, 'ج': 3, 'د': 4, 'ه': 5, 'و': 6, 'ز': 7, 'ح': 8, 'ط': 9,
+    'ي': 10, 'ى': 10, 'ك': 20, 'ک': 20, 'ل': 30, 'م': 40, 'ن': 50, 'س': 60, 'ع': 70, 'ف': 80,
+    'ص': 90, 'ق': 100, 'ر': 200, 'ش': 300, 'ت': 400, 'ث': 500, 'خ': 600, 'ذ': 700, 'ض': 800, 'ظ': 900, 'غ': 1000,
+    # Grund- und Schlussformen hebräischer Buchstaben
+
+    'א': 1, 'ב': 2, 'ג': 3, 'ד': 4, 'ה': 5, 'ו': 6, 'ז': 7, 'ח': 8, 'ט': 9, 'י': 10,
+    'כ': 20, 'ך': 500, 'ל': 30, 'מ': 40, 'ם': 600, 'נ': 50, 'ן': 700, 'ס': 60, 'ע': 70, 'פ': 80, 'ף': 800,
+    'צ': 90, 'ץ': 900, 'ק': 100, 'ר': 200, 'ש': 300, 'ת': 400,
+
+    # Arabische Tashkeel (Diacritics) und andere ignorierte Zeichen
+    'َ': 0, 'ُ': 0, 'ِ': 0, 'ً': 0, 'ٌ': 0, 'ٍ': 0, 'ْ': 0, 'ّ': 0, ' ': 0, '־': 0, ',': 0, '.': 0, '،': 0, '؛': 0, '-': 0, '_': 0,
+    # Griechische Buchstaben
+    'α': 1, 'β': 2, 'γ': 3, 'δ': 4, 'ε': 5, 'ϝ': 6, 'ζ': 7, 'η': 8, 'θ': 9, 'ι': 10,
+    'κ': 20, 'λ': 30, 'μ': 40, 'ν': 50, 'ξ': 60, 'ο': 70, 'π': 80, 'ϟ': 90, 'ρ': 100,
+    'σ': 200, 'τ': 300, 'υ': 400, 'φ': 500, 'χ': 600, 'ψ': 700, 'ω': 800, 'ϡ': 900,
+
+    # Griechische Großbuchstaben
+    'Α': 1, 'Β': 2, 'Γ': 3, 'Δ': 4, 'Ε': 5, 'Ϝ': 6, 'Ζ': 7, 'Η': 8, 'Θ': 9, 'Ι': 10,
+    'Κ': 20, 'Λ': 30, 'Μ': 40, 'Ν': 50, 'Ξ': 60, 'Ο': 70, 'Π': 80, 'Ϟ': 90, 'Ρ': 100,
+    'Σ': 200, 'Τ': 300, 'Υ': 400, 'Φ': 500, 'Χ': 600, 'Ψ': 700, 'Ω': 800, 'Ϡ': 900,
+
+    # Akut
+    'ά': 1, 'έ': 5, 'ή': 8, 'ί': 10, 'ό': 70, 'ύ': 400, 'ώ': 800,
+    'Ά': 1, 'Έ': 5, 'Ή': 8, 'Ί': 10, 'Ό': 70, 'Ύ': 400, 'Ώ': 800,
+    # Gravis
+    'ὰ': 1, 'ὲ': 5, 'ὴ': 8, 'ὶ': 10, 'ὸ': 70, 'ὺ': 400, 'ὼ': 800,
+    # Zirkumflex
+    'ᾶ': 1, 'ῆ': 8, 'ῖ': 10, 'ῦ': 400, 'ῶ': 800,
+    # Umlaut und andere Sonderzeichen
+    'ϊ': 10, 'ϋ': 400, 'ΐ': 10, 'ΰ': 400,
+    'ῒ': 10, 'ῗ': 10, 'ῢ': 400, 'ῧ': 400,
+    # Spiritus Asper (rauer Hauchlaut)
+    'ἁ': 1, 'ἑ': 5, 'ἡ': 8, 'ἱ': 10, 'ὁ': 70, 'ὑ': 400, 'ὡ': 800,
+    'Ἁ': 1, 'Ἑ': 5, 'Ἡ': 8, 'Ἱ': 10, 'Ὁ': 70, 'Ὑ': 400, 'Ὡ': 800,
+    # Spiritus Lenis (weicher Hauchlaut)
+    'ἀ': 1, 'ἐ': 5, 'ἠ': 8, 'ἰ': 10, 'ὀ': 70, 'ὐ': 400, 'ὠ': 800,
+    'Ἀ': 1, 'Ἐ': 5, 'Ἠ': 8, 'Ἰ': 10, 'Ὀ': 70, 'Ὠ': 800,
+    'σ': 200,  # Normal Sigma
+    'ς': 200,  # Sigma am Wortende
+    'á': 1, 'é': 5, 'í': 9, 'ó': 50, 'ú': 200, 'ý': 400,
+    'Á': 1, 'É': 5, 'Í': 9, 'Ó': 50, 'Ú': 200, 'Ý': 400,
+    'ē': 5,
+}
+
+# The 22 letters without final forms, as in products-inverses-yetzirah.py
+# and ratios-yetzirah.py
+STANDARD_VALUES = {
+    'א': 1, 'ב': 2, 'ג': 3, 'ד': 4, 'ה': 5, 'ו': 6, 'ז': 7, 'ח': 8,
+    'ט': 9, 'י': 10, 'כ': 20, 'ל': 30, 'מ': 40, 'נ': 50, 'ס': 60, 'ע': 70,
+    'פ': 80, 'צ': 90, 'ק': 100, 'ר': 200, 'ש': 300, 'ת': 400
+}
+
+# Final forms and the standard letter they belong to
+FINAL_TO_STANDARD = {'ך': 'כ', 'ם': 'מ', 'ן': 'נ', 'ף': 'פ', 'ץ': 'צ'}
+
+# Mispar gadol: the final forms continue the hundreds, as in the
+# GEMATRIA_TABLE of the sefer-yetzirah-calculations scripts
+GADOL_VALUES = {
+    'א': 1,   'ב': 2,   'ג': 3,   'ד': 4,   'ה': 5,
+    'ו': 6,   'ז': 7,   'ח': 8,   'ט': 9,   'י': 10,
+    'כ': 20,  'ך': 500, 'ל': 30,  'מ': 40,  'ם': 600,
+    'נ': 50,  'ן': 700, 'ס': 60,  'ע': 70,  'פ': 80,
+    'ף': 800, 'צ': 90,  'ץ': 900, 'ק': 100, 'ר': 200,
+    'ש': 300, 'ת': 400
+}
+
+# Mispar hechrachi: final forms count like their base letter
+_FINALS_AS_BASE = {final: STANDARD_VALUES[base] for final, base in FINAL_TO_STANDARD.items()}
+HECHRACHI_VALUES = {letter: _FINALS_AS_BASE.get(letter, value)
+                    for letter, value in GADOL_VALUES.items()}
+MULTI_SCRIPT_HECHRACHI_VALUES = {**MULTI_SCRIPT_VALUES, **_FINALS_AS_BASE}
+
+# The 22 standard letters of Sefer Yetzirah and their classes
+LETTERS_22 = [
+    'א','ב','ג','ד','ה','ו','ז','ח','ט','י',
+    'כ','ל','מ','נ','ס','ע','פ','צ','ק','ר','ש','ת'
+]
+MOTHERS = ['א','מ','ש']                # 3
+DOUBLES = ['ב','ג','ד','כ','פ','ר','ת'] # 7
+# The remaining 12 letters are the Simples.
+
+# Spelled-out letter names (for mispar milui), as in the
+# sefer-yetzirah-calculations-o1 scripts but with נון in Hebrew letters
+HEBREW_LETTER_NAMES = {
+    'א': 'אלף', 'ב': 'בית', 'ג': 'גימל', 'ד': 'דלת', 'ה': 'הא', 'ו': 'ואו',
+    'ז': 'זין', 'ח': 'חית', 'ט': 'טית', 'י': 'יוד', 'כ': 'כף', 'ל': 'למד',
+    'מ': 'מם', 'נ': 'נון', 'ס': 'סמך', 'ע': 'עין', 'פ': 'פה', 'צ': 'צדי',
+    'ק': 'קוף', 'ר': 'ריש', 'ש': 'שין', 'ת': 'תיו'
+}
+
+# The 10 Sefirot in Hebrew
+SEFIROT_HEBREW = ['כתר','חכמה','בינה','חסד','גבורה','תפארת','נצח','הוד','יסוד','מלכות']
@@ -0,0 +1,114 @@
+"""
+Unknown-character accounting for whole corpora.
+
+The old scripts printed "Warnung: Unbekanntes Zeichen" once per occurrence.
+Here a corpus is encoded once (gematria.batch) and every codepoint is
+checked against a per-system known mask with one fancy-indexing step.
+Characters that count 0 by design (engine.counts_zero: punctuation,
+separators, whitespace, control and format characters, combining marks
+and the final forms of a table that only lists base letters) are known
+everywhere; which letters are known depends on the lookup the caller
+scores with:
+
+- exact (default): the table's own codepoints, as score_corpus and
+  gematria.analyze look them up
+- folded:          everything GematriaEngine resolves (gematria-sum.py, the
+                   server, the HTTP service, gematria.scripts), e.g. ῇ or ئ
+                   through their base letter
+
+The result holds the number of unknown characters per verse and per
+distinct codepoint for the whole corpus, so callers report them once, or
+refuse them in strict mode.
+
+Usage:
+    python -m gematria.unknown sefer_yetzirah.json [--system standard] [--folded] [--verses]
+"""
+
+import argparse
+from collections import Counter
+from functools import lru_cache
+from typing import NamedTuple
+
+import numpy as np
+
+from .batch import encode_corpus, segment_reduce
+from .corpus import iter_verses
+from .engine import GematriaEngine, counts_zero, format_unknown
+from .systems import SYSTEMS, system
+
+# The known mask covers the Basic Multilingual Plane; beyond it only table
+# entries are known, and no table has any.
+MASK_SIZE = 0x10000
+
+
+class UnknownCounts(NamedTuple):
+    per_verse: np.ndarray    # unknown characters per verse
+    codepoints: np.ndarray   # distinct unknown codepoints, ascending
+    totals: np.ndarray       # corpus count of each of `codepoints`
+
+    def counter(self) -> Counter:
+        """The corpus counts as a {char: count} Counter."""
+        return Counter(dict(zip(map(chr, self.codepoints.tolist()), self.totals.tolist())))
+
+
+@lru_cache(maxsize=None)
+def known_mask(name, folded=False) -> np.ndarray:
+    """Read-only bool array: codepoint -> counts as known in system `name`."""
+    if folded:
+        known = GematriaEngine(system(name)).knows
+    else:
+        table = system(name)
+        known = lambda char: char in table or counts_zero(char, table)
+    mask = np.fromiter((known(chr(c)) for c in range(MASK_SIZE)), dtype=bool, count=MASK_SIZE)
+    mask.setflags(write=False)
+    return mask
+
+
+def count_unknown_encoded(codepoints, offsets, system_name="standard", folded=False) -> UnknownCounts:
+    """count_unknown for a corpus already encoded by encode_corpus."""
+    mask = known_mask(system_name, folded)
+    inside = codepoints < len(mask)
+    unknown = ~(mask[np.where(inside, codepoints, 0)] & inside)
+    per_verse = segment_reduce(np.add, unknown.astype(np.int64), offsets, 0)
+    distinct, totals = np.unique(codepoints[unknown], return_counts=True)
+    return UnknownCounts(per_verse, distinct, totals)
+
+
+def count_unknown(verses, system_name="standard", folded=False) -> UnknownCounts:
+    """
+    Counts the characters without a value per verse and for the corpus;
+    `folded` selects the engine's folded lookup instead of the exact one.
+    """
+    if system_name not in SYSTEMS:
+        raise ValueError(f"unknown gematria system {system_name!r}; choose from {', '.join(SYSTEMS)}")
+    return count_unknown_encoded(*encode_corpus(verses), system_name, folded)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("corpora", nargs="+")
+    parser.add_argument("--system", choices=list(SYSTEMS), default="standard")
+    parser.add_argument("--folded", action="store_true",
+                        help="count against the engine's folding (gematria-sum.py, the server)")
+    parser.add_argument("--verses", action="store_true",
+                        help="also list every verse with unknown characters")
+    parser.add_argument("--normalize", action="store_true",
+                        help="strip niqqud, te'amim, tashkeel and Greek accents first")
+    args = parser.parse_args(argv)
+
+    for path in args.corpora:
+        records = list(iter_verses(path, args.normalize))
+        counts = count_unknown([text for _, _, text in records], args.system, args.folded)
+        affected = np.flatnonzero(counts.per_verse)
+        print(f"{path}: {int(counts.totals.sum())} unknown characters in "
+              f"{len(affected)} of {len(records)} verses")
+        if len(counts.codepoints):
+            print(format_unknown(counts.counter()))
+        if args.verses:
+            for i in affected.tolist():
+                chapter, verse, text = records[i]
+                print(f"{chapter}\t{verse}\t{counts.per_verse[i]}\t{text}")
+
+
+if __name__ == "__main__":
+    main()
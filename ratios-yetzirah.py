@@ -1,12 +1,15 @@
-import json
 import sys
 import numpy as np
 
-valores_gematria = {
-    'א': 1, 'ב': 2, 'ג': 3, 'ד': 4, 'ה': 5, 'ו': 6, 'ז': 7, 'ח': 8,
-    'ט': 9, 'י': 10, 'כ': 20, 'ל': 30, 'מ': 40, 'נ': 50, 'ס': 60, 'ע': 70,
-    'פ': 80, 'צ': 90, 'ק': 100, 'ר': 200, 'ש': 300, 'ת': 400
-}
+from gematria.batch import score_corpus
+from gematria.corpus import iter_verses
+from gematria.notarikon import notarikon
+from gematria.ratios import adjacent_ratios
+from gematria.reverse import ReverseIndex
+from gematria.systems import LOOKUPS, SYSTEMS
+
+# Valores de gematría: las 22 letras, sin formas finales
+valores_gematria = SYSTEMS["standard"]
 
 # Función para convertir texto a valores de gematría
 def texto_a_gematria(texto):
@@ -16,30 +19,27 @@ def texto_a_gematria(texto):
         gematria.append(valor)
     return gematria
 
+# Índice valor -> letra, construido una sola vez
+indice_inverso = ReverseIndex(valores_gematria)
+
 # Función para convertir valores de gematría a texto en hebreo
 def gematria_a_texto(gematria):
-    texto = ""
-    for val in gematria:
-        for letra, valor in valores_gematria.items():
-            if valor == val:
-                texto += letra
-                break
-    return texto
-
-res=[]
-secret = ""
-ftorah = open("sefer_yetzirah.json","r").read()
-for x in json.loads(ftorah)["text"]:
-    for t in x:
-        secret += t[0:2]
-        print(t)
-        togem = list(filter((0).__ne__, texto_a_gematria(t.replace(" ",""))))
-        res.append(togem)
-
-#print(res)
-for x in res:
-
-    ratios = [x[i] / x[i-1] for i in range(1, len(x))]
-    print(ratios)
+    return indice_inverso.decode(gematria)
+
+originales = []
+textos = []
+for _, _, t in iter_verses("sefer_yetzirah.json"):
+    print(t)
+    originales.append(t)
+    textos.append(t.replace(" ",""))
+
+# Las dos primeras letras de cada verso, extraídas de una vez
+secret = notarikon(originales, "verses", (0, 1), None).text
+
+# Todas las razones de todos los versos de una vez, sobre el arreglo plano
+res = score_corpus(textos, LOOKUPS["standard"])
+razones = adjacent_ratios(res.values, res.offsets)
+for i in range(len(textos)):
+    print(razones.ratios[razones.offsets[i]:razones.offsets[i + 1]].tolist())
 
 print(secret)
@@ -42,7 +42,8 @@ Enjoy exploring, expanding, or hacking it for deeper secrets. cryptocalypse2
 might be a code name for your own expansions or a next-level puzzle.
 """
 
-import itertools
+from gematria.gates import GateMatrices, Gates
+from gematria.systems import SYSTEMS
 
 ###############################################################################
 # 1) HEBREW LETTERS: Original Names, Gematria Table, Basic Info
@@ -52,14 +53,7 @@ import itertools
 # We'll treat final letters (ך ם ן ף ץ) as separate for summation
 # but NOT as part of the main 22 standard letters in Sefer Yetzirah classification.
 
-GEMATRIA_TABLE = {
-    'א': 1,   'ב': 2,   'ג': 3,   'ד': 4,   'ה': 5,
-    'ו': 6,   'ז': 7,   'ח': 8,   'ט': 9,   'י': 10,
-    'כ': 20,  'ך': 500, 'ל': 30,  'מ': 40,  'ם': 600,
-    'נ': 50,  'ן': 700, 'ס': 60,  'ע': 70,  'פ': 80,
-    'ף': 800, 'צ': 90,  'ץ': 900, 'ק': 100, 'ר': 200,
-    'ש': 300, 'ת': 400
-}
+GEMATRIA_TABLE = SYSTEMS["gadol"]
 
 # The 22 standard letters used in Sefer Yetzirah:
 STANDARD_22_LETTERS = [
@@ -168,11 +162,9 @@ def generate_231_gates(ordered=False):
     Generates the '231 Gates' from the 22 standard letters.
     By default (ordered=False), we get 231 combinations: 22 choose 2 = 231.
     If ordered=True, permutations -> 462 pairs.
+    The gates are computed lazily; len(), indexing and slicing work as on a list.
     """
-    if ordered:
-        return list(itertools.permutations(STANDARD_22_LETTERS, 2))
-    else:
-        return list(itertools.combinations(STANDARD_22_LETTERS, 2))
+    return Gates(STANDARD_22_LETTERS, 2, ordered=ordered)
 
 def gematria_of_gate(gate) -> int:
     """
@@ -247,6 +239,10 @@ def add_suffix_gematria(base_word: str, suffix: str) -> int:
 ###############################################################################
 # We interpret "geometrical" loosely as numeric manipulations: sums, differences, ratios.
 
+# Letter values and spelled-out name values of the 22 letters, computed once;
+# every gate metric is then a lookup in a 22x22 matrix.
+GATE_MATRICES = GateMatrices(STANDARD_22_LETTERS, gematria_value, letter_name_gematria)
+
 def gates_numeric_analysis(gates):
     """
     For each pair (gate), compute:
@@ -255,6 +251,9 @@ def gates_numeric_analysis(gates):
      - difference of spelled-out name gematria.
     Returns a list of dicts so you can further investigate patterns.
     """
+    if GATE_MATRICES.covers(gates):
+        return GATE_MATRICES.analysis(gates)
+
     results = []
     for gate in gates:
         letter1, letter2 = gate
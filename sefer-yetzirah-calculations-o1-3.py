@@ -37,7 +37,8 @@ This script is an experimental sandbox demonstrating numeric manipulations
 in a Kabbalistic context, not an authoritative commentary on Sefer Yetzirah.
 """
 
-import itertools
+from gematria.gates import GateMatrices, Gates
+from gematria.systems import SYSTEMS
 
 ###############################################################################
 # 1) HEBREW LETTERS: Original Names, Gematria Table, Basic Info
@@ -45,14 +46,7 @@ import itertools
 
 # Main Gematria Table (including final letters).
 # In Sefer Yetzirah classification, final letters are not separate from the 22 standard.
-GEMATRIA_TABLE = {
-    'א': 1,   'ב': 2,   'ג': 3,   'ד': 4,   'ה': 5,
-    'ו': 6,   'ז': 7,   'ח': 8,   'ט': 9,   'י': 10,
-    'כ': 20,  'ך': 500, 'ל': 30,  'מ': 40,  'ם': 600,
-    'נ': 50,  'ן': 700, 'ס': 60,  'ע': 70,  'פ': 80,
-    'ף': 800, 'צ': 90,  'ץ': 900, 'ק': 100, 'ר': 200,
-    'ש': 300, 'ת': 400
-}
+GEMATRIA_TABLE = SYSTEMS["gadol"]
 
 # The 22 standard letters used in Sefer Yetzirah:
 STANDARD_22_LETTERS = [
@@ -171,11 +165,9 @@ def generate_231_gates(ordered=False):
     Generates the '231 Gates' from the 22 standard letters.
     By default (ordered=False), we get 231 combinations: 22 choose 2 = 231.
     If ordered=True, permutations -> 462 pairs.
+    The gates are computed lazily; len(), indexing and slicing work as on a list.
     """
-    if ordered:
-        return list(itertools.permutations(STANDARD_22_LETTERS, 2))
-    else:
-        return list(itertools.combinations(STANDARD_22_LETTERS, 2))
+    return Gates(STANDARD_22_LETTERS, 2, ordered=ordered)
 
 def gematria_of_gate(gate) -> int:
     """
@@ -282,6 +274,10 @@ def sefer_yetzirah_geometry():
 ###############################################################################
 # 8) MISSING FUNCTION FROM BEFORE: gates_numeric_analysis()
 ###############################################################################
+# Letter values and spelled-out name values of the 22 letters, computed once;
+# every gate metric is then a lookup in a 22x22 matrix.
+GATE_MATRICES = GateMatrices(STANDARD_22_LETTERS, gematria_value, letter_name_gematria)
+
 def gates_numeric_analysis(gates):
     """
     For each pair (gate), compute:
@@ -292,6 +288,9 @@ def gates_numeric_analysis(gates):
     Returns a list of dictionaries, each describing these metrics
     so you can investigate deeper patterns or numeric relationships.
     """
+    if GATE_MATRICES.covers(gates):
+        return GATE_MATRICES.analysis(gates)
+
     results = []
     for gate in gates:
         letter1, letter2 = gate
@@ -25,7 +25,8 @@ on Kabbalistic tradition. Different sources use different assignments. Expand or
 © 2025, Emergent Rebel & Astra's Shadow
 """
 
-import itertools
+from gematria.gates import Gates
+from gematria.systems import SYSTEMS
 
 ########################################
 # 1) HEBREW LETTERS + GEMATRIA VALUES  #
@@ -33,16 +34,8 @@ import itertools
 
 # Original Gematria table (including final letters) as provided,
 # but for the 22 standard letters we typically ignore final forms.
-# The user’s table is repeated here:
-
-GEMATRIA_TABLE = {
-    'א': 1,   'ב': 2,   'ג': 3,   'ד': 4,   'ה': 5,
-    'ו': 6,   'ז': 7,   'ח': 8,   'ט': 9,   'י': 10,
-    'כ': 20,  'ך': 500, 'ל': 30,  'מ': 40,  'ם': 600,
-    'נ': 50,  'ן': 700, 'ס': 60,  'ע': 70,  'פ': 80,
-    'ף': 800, 'צ': 90,  'ץ': 900, 'ק': 100, 'ר': 200,
-    'ש': 300, 'ת': 400
-}
+# The user’s table (mispar gadol, final forms 500 ... 900) is shared:
+GEMATRIA_TABLE = SYSTEMS["gadol"]
 
 # The typical 22-letter sequence used in Sefer Yetzirah:
 HEBREW_LETTERS_22 = [
@@ -117,18 +110,15 @@ def generate_231_gates(letters=None, ordered=False):
 
     :param letters: optional list of letters; defaults to HEBREW_LETTERS_22
     :param ordered: If True, return permutations (462). If False, combos (231).
-    :return: list of tuples representing the pairs.
+    :return: lazy sequence of tuples representing the pairs (len, indexing
+             and slicing work as on a list, without building one).
     """
     if letters is None:
         letters = HEBREW_LETTERS_22
 
-    if ordered:
-        # permutations -> (A,B) is distinct from (B,A)
-        pairs = list(itertools.permutations(letters, 2))
-    else:
-        # combinations -> (A,B) is the same as (B,A)
-        pairs = list(itertools.combinations(letters, 2))
-    return pairs
+    # permutations -> (A,B) is distinct from (B,A)
+    # combinations -> (A,B) is the same as (B,A)
+    return Gates(letters, 2, ordered=ordered)
 
 ##############################################
 # 5) 10 SEFIROT (Basic "Depth" Placeholder)
@@ -0,0 +1,20 @@
+from gematria.cache import ResultCache, cache_key
+
+
+def test_repeated_keys_are_counted_once(tmp_path):
+    with ResultCache(tmp_path / "results.sqlite") as cache:
+        key = cache_key("אבג", "hechrachi", "analyze:float")
+        cache.put_many([(key, (1, 2, 3)), (key, (1, 2, 3))])
+        stored = cache.db.execute("SELECT SUM(size) FROM results").fetchone()[0]
+        assert len(cache) == 1
+        assert cache.size == stored
+
+
+def test_evicts_least_recently_used(tmp_path):
+    keys = [cache_key(str(i), "hechrachi", "analyze:float") for i in range(3)]
+    with ResultCache(tmp_path / "results.sqlite", max_bytes=10**6) as cache:
+        cache.put_many([(keys[0], "a" * 100), (keys[1], "b" * 100)])
+        cache.get_many([keys[0]])
+        cache.max_bytes = cache.size
+        cache.put_many([(keys[2], "c" * 100)])
+        assert set(cache.get_many(keys)) == {keys[0], keys[2]}
@@ -0,0 +1,23 @@
+from pathlib import Path
+
+from gematria.analyze import analyze
+from gematria.columnar import read_results, write_results
+from gematria.corpus import iter_verses
+
+CORPUS = Path(__file__).parent.parent / "sefer_yetzirah.json"
+
+
+def test_rewrite_drops_stale_columns(tmp_path):
+    for mode in ("log", "float"):
+        write_results(tmp_path, analyze(iter_verses(CORPUS), mode=mode, workers=1), mode)
+    columns = read_results(tmp_path)
+    assert "product" in columns
+    assert "product_mantissa" not in columns
+
+
+def test_log_mode_has_no_overflow(tmp_path):
+    path = tmp_path / "results.npz"
+    write_results(path, analyze(iter_verses(CORPUS), mode="log", workers=1), "log")
+    columns = read_results(path)
+    assert "product" not in columns
+    assert (columns["product_exponent"] == columns["product_log10"].astype(int)).all()
@@ -0,0 +1,55 @@
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from gematria.corpus import iter_verses
+from gematria.els import letter_stream, search_els
+
+CORPUS = Path(__file__).parent.parent / "sefer_yetzirah.json"
+
+
+def brute_force(letters, term, max_skip, both_directions):
+    """Sorted (start, skip) pairs, by trying every start and skip."""
+    found = []
+    for skip in range(1, max_skip + 1):
+        for start in range(len(letters)):
+            for sign in (1, -1) if both_directions else (1,):
+                positions = [start + sign * i * skip for i in range(len(term))]
+                if all(0 <= p < len(letters) and letters[p] == c for p, c in zip(positions, term)):
+                    found.append((start, sign * skip))
+    return sorted(found, key=lambda hit: (abs(hit[1]), hit[0]))
+
+
+def test_matches_brute_force():
+    rng = np.random.default_rng(1)
+    for _ in range(200):
+        letters = rng.integers(0, 3, rng.integers(1, 60)).astype(np.uint32)
+        term = rng.integers(0, 3, rng.integers(2, 4)).astype(np.uint32)
+        max_skip = int(rng.integers(1, 20))
+        both = bool(rng.integers(0, 2))
+        hits = search_els(letters, term, 1, max_skip, both)
+        expected = brute_force(letters.tolist(), term.tolist(), max_skip, both)
+        assert sorted(zip(hits.start.tolist(), hits.skip.tolist()),
+                      key=lambda hit: (abs(hit[1]), hit[0])) == expected
+
+
+def test_workers_agree():
+    stream = letter_stream([text for _, _, text in iter_verses(CORPUS)])
+    single = search_els(stream, "תורה", 1, 300)
+    pooled = search_els(stream, "תורה", 1, 300, workers=2, chunk_skips=64)
+    assert np.array_equal(single.start, pooled.start)
+    assert np.array_equal(single.skip, pooled.skip)
+
+
+def test_single_letter_is_rejected():
+    with pytest.raises(ValueError):
+        search_els(np.arange(10, dtype=np.uint32), "א")
+
+
+@pytest.mark.parametrize("system_name", ["standard", "hechrachi", "gadol"])
+def test_finals_stay_in_the_stream(system_name):
+    stream = letter_stream(["שלום, עולם!"], system_name)
+    assert stream.letters.tobytes().decode("utf-32-le") == "שלומעולמ"
+    stream = letter_stream(["שלום, עולם!"], system_name, finals=True)
+    assert stream.letters.tobytes().decode("utf-32-le") == "שלוםעולם"
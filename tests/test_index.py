@@ -0,0 +1,30 @@
+from collections import Counter
+from pathlib import Path
+
+from gematria.batch import split_words
+from gematria.corpus import iter_verses
+from gematria.index import ValueIndex
+from gematria.systems import system
+
+CORPUS = Path(__file__).parent.parent / "sefer_yetzirah.json"
+
+
+def test_final_letters_are_valued():
+    index = ValueIndex.build(iter_verses(CORPUS))
+    assert "אלהים" in {o.text for o in index.find(86)}
+    assert "אלהים" not in {o.text for o in index.find(46)}
+
+
+def test_matches_brute_force():
+    values = system("hechrachi")
+    expected = Counter()
+    for _, _, text in iter_verses(CORPUS):
+        words = [sum(values.get(c, 0) for c in w) for w in split_words(text)]
+        words = [v for v in words if v]
+        for start in range(len(words)):
+            for length in (1, 2, 3):
+                if start + length <= len(words):
+                    expected[sum(words[start:start + length])] += 1
+    index = ValueIndex.build(iter_verses(CORPUS), max_words=3)
+    assert {v: index.count(v) for v in expected} == expected
+    assert len(index.values) == sum(expected.values())
@@ -0,0 +1,35 @@
+from pathlib import Path
+
+import pytest
+
+from gematria.batch import split_words
+from gematria.corpus import iter_verses
+from gematria.methods import score_methods
+from gematria.systems import system
+
+CORPUS = Path(__file__).parent.parent / "sefer_yetzirah.json"
+
+
+@pytest.mark.parametrize("text, words", [
+    ("שָׁלוֹם עוֹלָם", 2),
+    ("שלום עולם", 2),
+    ("רמב״ם", 1),
+    ("ה' א־ב , .", 3),
+    ("", 0),
+])
+def test_kolel_counts_words(text, words):
+    scores = score_methods([text])
+    assert scores.words.tolist() == [words]
+    assert scores.column("kolel")[0] == scores.column("hechrachi")[0] + words
+
+
+def test_pointed_text_scores_like_unpointed():
+    pointed, plain = score_methods(["שָׁלוֹם עוֹלָם", "שלום עולם"]).values.tolist()
+    assert pointed == plain
+
+
+def test_words_match_split_words():
+    texts = [text for _, _, text in iter_verses(CORPUS)]
+    values = system("hechrachi")
+    expected = [sum(1 for w in split_words(t) if any(values.get(c) for c in w)) for t in texts]
+    assert score_methods(texts).words.tolist() == expected
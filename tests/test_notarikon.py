@@ -0,0 +1,62 @@
+from pathlib import Path
+
+import numpy as np
+
+from gematria.batch import split_words
+from gematria.corpus import iter_verses
+from gematria.notarikon import UNITS, notarikon
+from gematria.systems import system
+from gematria.tables import FINAL_TO_STANDARD
+
+CORPUS = Path(__file__).parent.parent / "sefer_yetzirah.json"
+
+ALPHABET = list("אבגדםןך ,.'־") + ["ְ", " "]
+
+
+def brute_force(verses, unit, positions, system_name):
+    values = system(system_name)
+    letters = lambda text: [c for c in text if values.get(FINAL_TO_STANDARD.get(c, c))]
+    per_verse = []
+    for text in verses:
+        if unit == "words":
+            units = [letters(word) for word in split_words(text)]
+        elif unit == "triplets":
+            flat = letters(text)
+            units = [flat[i:i + 3] for i in range(0, len(flat), 3)]
+        else:
+            units = [letters(text)]
+        per_verse.append("".join(u[p] for u in units for p in positions if -len(u) <= p < len(u)))
+    return per_verse
+
+
+def split(extraction):
+    offsets = extraction.offsets.tolist()
+    return [extraction.text[a:b] for a, b in zip(offsets[:-1], offsets[1:])]
+
+
+def test_matches_brute_force():
+    rng = np.random.default_rng(2)
+    for _ in range(500):
+        verses = ["".join(rng.choice(ALPHABET, rng.integers(0, 20))) for _ in range(rng.integers(1, 5))]
+        unit = UNITS[rng.integers(len(UNITS))]
+        positions = rng.integers(-3, 3, rng.integers(1, 3)).tolist()
+        system_name = rng.choice(["hechrachi", "standard"])
+        assert split(notarikon(verses, unit, positions, system_name)) == \
+            brute_force(verses, unit, positions, system_name), (verses, unit, positions)
+
+
+def test_no_punctuation_on_corpus():
+    texts = [text for _, _, text in iter_verses(CORPUS)]
+    for unit in UNITS:
+        extraction = notarikon(texts, unit, (0, -1))
+        assert not set(extraction.text) & set(",.'- ")
+        assert split(extraction) == brute_force(texts, unit, (0, -1), "hechrachi")
+
+
+def test_raw_verses():
+    texts = ["ב' ג", "", "אב"]
+    assert notarikon(texts, "verses", (0, 1), None).text == "".join(t[0:2] for t in texts)
+
+
+def test_finals_under_standard():
+    assert notarikon(["שלום עולם"], "words", (-1,), "standard").text == "םם"
@@ -0,0 +1,17 @@
+import pytest
+
+matplotlib = pytest.importorskip("matplotlib")
+matplotlib.use("Agg")
+
+from gematria.render import DiagramRenderer  # noqa: E402
+
+
+def test_ordering_must_fill_the_ring():
+    renderer = DiagramRenderer()
+    try:
+        with pytest.raises(ValueError):
+            renderer.set_ordering("אבג")
+        renderer.set_ordering(renderer.letters[::-1])
+        assert [t.get_text() for t in renderer.labels] == renderer.letters
+    finally:
+        renderer.close()
@@ -0,0 +1,55 @@
+from pathlib import Path
+
+import numpy as np
+
+from gematria.corpus import iter_verses
+from gematria.search import find_windows, search_letters, search_words
+from gematria.systems import system
+
+CORPUS = Path(__file__).parent.parent / "sefer_yetzirah.json"
+
+
+def brute_force(verses, targets, max_length=None):
+    """(target, verse, start, stop) of every window, by enumeration."""
+    found = []
+    for target in targets:
+        for v, values in enumerate(verses):
+            for start in range(len(values)):
+                for stop in range(start + 1, len(values) + 1):
+                    if max_length is not None and stop - start > max_length:
+                        break
+                    if sum(values[start:stop]) == target:
+                        found.append((target, v, start, stop))
+    return found
+
+
+def as_tuples(windows):
+    return list(zip(*(column.tolist() for column in windows)))
+
+
+def test_find_windows_matches_brute_force():
+    rng = np.random.default_rng(0)
+    for _ in range(300):
+        verses = [rng.integers(1, 30, rng.integers(0, 12)).tolist() for _ in range(rng.integers(1, 5))]
+        offsets = np.cumsum([0] + [len(v) for v in verses])
+        targets = sorted(set(rng.integers(1, 80, 3).tolist()))
+        max_length = rng.choice([None, 1, 3])
+        flat = [x for v in verses for x in v]
+        windows = find_windows(flat, offsets, targets, max_length)
+        assert as_tuples(windows) == brute_force(verses, targets, max_length)
+
+
+def test_search_letters_on_corpus():
+    texts = [text for _, _, text in iter_verses(CORPUS)]
+    values = system("hechrachi")
+    verses = [[values[c] for c in text if values.get(c)] for text in texts]
+    windows, letters = search_letters(texts, [26, 86])
+    assert as_tuples(windows) == brute_force(verses, [26, 86])
+    # Final letters count like their base letter
+    assert "אלהים" in {letters[v][a:b] for _, v, a, b in as_tuples(windows)}
+
+
+def test_search_words_on_corpus():
+    texts = [text for _, _, text in iter_verses(CORPUS)]
+    windows, words = search_words(texts, [86], max_length=1)
+    assert "אלהים" in {words[v][a] for _, v, a, _ in as_tuples(windows)}
@@ -0,0 +1,45 @@
+from pathlib import Path
+
+from gematria.corpus import iter_verses
+from gematria.index import ValueIndex
+from gematria.server import GematriaService
+
+CORPUS = Path(__file__).parent.parent / "sefer_yetzirah.json"
+
+
+def test_words_agree_with_methods():
+    service = GematriaService(index=ValueIndex.build(iter_verses(CORPUS), max_words=3))
+    session = {}
+    assert service.handle("methods אלהים", session)["hechrachi"] == 86
+    answer = service.handle("words 86", session)
+    assert "אלהים" in {occurrence[-1] for occurrence in answer["occurrences"]}
+
+
+def test_errors_are_answered():
+    service = GematriaService()
+    assert "error" in service.handle("words 86", {})
+    assert "error" in service.handle("system nope", {})
+    assert service.handle("value אב! ☃", {}) == {"value": 3, "unknown": ["☃"]}
+
+
+def test_pointed_methods():
+    service = GematriaService()
+    assert service.handle("methods שָׁלוֹם", {}) == service.handle("methods שלום", {})
+    assert service.handle("methods רמב״ם", {})["kolel"] == service.handle("methods רמבם", {})["kolel"]
+
+
+def test_value_answers_can_be_looked_up():
+    service = GematriaService(index=ValueIndex.build(iter_verses(CORPUS), "multi-hechrachi"))
+    session = {}
+    value = service.handle("value אלהים", session)["value"]
+    assert value == 86
+    assert "אלהים" in {o[-1] for o in service.handle(f"words {value}", session)["occurrences"]}
+
+
+def test_words_refuses_another_system():
+    service = GematriaService(index=ValueIndex.build(iter_verses(CORPUS), "hechrachi"))
+    session = {}
+    service.handle("system multi", session)
+    assert "error" in service.handle("words 86", session)
+    service.handle("system hechrachi", session)
+    assert "occurrences" in service.handle("words 86", session)
@@ -0,0 +1,52 @@
+import asyncio
+import json
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import quote
+
+import pytest
+
+from gematria.service import Batcher, _parse_query, make_handler
+
+
+@pytest.mark.parametrize("body", [
+    b'{"texts": ["a"], "methods": [{}]}',
+    b'{"texts": ["a"], "system": ["x"]}',
+    b'{"texts": ["a"], "methods": "gadol"}',
+    b'{"texts": "a"}',
+    b'[1, 2]',
+    b'{"texts": ["a"], "system": "nope"}',
+])
+def test_bad_queries_are_value_errors(body):
+    with pytest.raises(ValueError):
+        _parse_query("/score", body)
+
+
+async def _exchange(request):
+    with ThreadPoolExecutor(1) as executor:
+        server = await asyncio.start_server(make_handler(Batcher(executor)), "127.0.0.1", 0)
+        port = server.sockets[0].getsockname()[1]
+        async with server:
+            reader, writer = await asyncio.open_connection("127.0.0.1", port)
+            writer.write(request)
+            response = await reader.read()
+            writer.close()
+    status = int(response.split(b" ", 2)[1])
+    return status, json.loads(response.partition(b"\r\n\r\n")[2])
+
+
+@pytest.mark.parametrize("request_bytes", [
+    b'POST /score HTTP/1.1\r\nContent-Length: 33\r\nConnection: close\r\n\r\n{"texts":["a"],"methods":[{}]}   ',
+    b'POST /score HTTP/1.1\r\nContent-Length: abc\r\n\r\n',
+    b'GARBAGE\r\n\r\n',
+])
+def test_bad_requests_get_400(request_bytes):
+    status, answer = asyncio.run(_exchange(request_bytes))
+    assert status == 400
+    assert "error" in answer
+
+
+def test_score():
+    status, answer = asyncio.run(_exchange(
+        f"GET /score?text={quote('אלהים')}&methods=hechrachi HTTP/1.1\r\nConnection: close\r\n\r\n".encode()))
+    assert status == 200
+    assert answer["results"][0]["methods"] == {"hechrachi": 86}
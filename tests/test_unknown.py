@@ -0,0 +1,46 @@
+from collections import Counter
+from pathlib import Path
+
+import pytest
+
+from gematria.analyze import analyze
+from gematria.corpus import iter_verses
+from gematria.engine import GematriaEngine
+from gematria.systems import system
+from gematria.unknown import count_unknown
+
+CORPUS = Path(__file__).parent.parent / "sefer_yetzirah.json"
+
+
+@pytest.mark.parametrize("table", ["standard", "hechrachi", "gadol", "multi"])
+def test_corpus_is_clean(table):
+    counts = count_unknown([text for _, _, text in iter_verses(CORPUS)], table)
+    assert not counts.per_verse.any()
+    unknown = Counter()
+    assert list(analyze(iter_verses(CORPUS), table, workers=1, unknown=unknown, strict=True))
+    assert not unknown
+
+
+def test_counts_per_verse_and_corpus():
+    counts = count_unknown(["אב, ג׃ ☃☃", "", "abc ם", "αβ"], "standard")
+    assert counts.per_verse.tolist() == [2, 0, 3, 2]
+    assert counts.counter() == Counter({"☃": 2, "a": 1, "b": 1, "c": 1, "α": 1, "β": 1})
+
+
+def test_strict_analyze_names_the_verse():
+    records = [(0, 0, "אב"), (0, 1, "אב ☃")]
+    with pytest.raises(ValueError, match="verse 0:1"):
+        list(analyze(records, workers=1, strict=True))
+
+
+def test_engine_and_folded_counts_agree():
+    text = "שלום! ῇ ئ ☃ X"
+    for name in ("standard", "multi"):
+        engine = GematriaEngine(system(name))
+        assert count_unknown([text], name, folded=True).counter() == engine.unknown(text)
+    assert GematriaEngine(system("standard"), strict=True).score("שלום!") == 336
+
+
+def test_exact_counts_follow_the_table():
+    assert "ῇ" in count_unknown(["ῇ"], "multi").counter()
+    assert not count_unknown(["ῇ"], "multi", folded=True).per_verse.any()